@@ -2,7 +2,7 @@ from panoptes_client.classification import Classification
 from panoptes_client.collection import Collection
 from panoptes_client.collection_role import CollectionRole
 from panoptes_client.organization import Organization
-from panoptes_client.panoptes import Panoptes
+from panoptes_client.panoptes import ObjectCache, Panoptes
 from panoptes_client.project import Project
 from panoptes_client.project_preferences import ProjectPreferences
 from panoptes_client.project_role import ProjectRole
@@ -37,6 +37,10 @@ class Collection(PanoptesObject):
 
         if not id and not slug:
             return None
+        if id and not slug:
+            cached_object = cls._cached(id)
+            if cached_object is not None:
+                return cached_object
         try:
             return cls.where(id=id, slug=slug).next()
         except StopIteration:
@@ -0,0 +1,330 @@
+import csv
+import json
+import logging
+import queue
+import threading
+import time
+
+from panoptes_client.panoptes import Panoptes
+from panoptes_client.subject import (
+    ASYNC_SAVE_THREADS,
+    AsyncSaveExecutor,
+    MediaIndex,
+    Subject,
+)
+from panoptes_client.utils import read_json_lines
+
+logger = logging.getLogger('panoptes_client')
+
+# Subjects linked to the subject set per request
+INGEST_LINK_BATCH_SIZE = 100
+
+
+class StageStats(object):
+    """
+    Throughput of one stage of :py:meth:`.SubjectSet.ingest`.
+
+    - **count** is the number of items the stage has finished.
+    - **elapsed** is the number of seconds from the stage's first item
+      starting to its last item finishing.
+    - **rate** is the number of items per second.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def record(self, started, finished, count=1):
+        with self._lock:
+            self.count += count
+            if self.started is None or started < self.started:
+                self.started = started
+            if self.finished is None or finished > self.finished:
+                self.finished = finished
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0
+        return self.finished - self.started
+
+    @property
+    def rate(self):
+        if not self.elapsed:
+            return 0
+        return self.count / self.elapsed
+
+    def __repr__(self):
+        return '<StageStats {}: {} in {:.1f}s ({:.1f}/s)>'.format(
+            self.name,
+            self.count,
+            self.elapsed,
+            self.rate,
+        )
+
+
+class IngestResult(object):
+    """
+    Returned by :py:meth:`.SubjectSet.ingest`.
+
+    - **stages** is a :py:class:`dict` of :py:class:`StageStats` for the
+      ``'create'``, ``'upload'`` and ``'link'`` stages. A subject's create
+      stage includes waiting for its uploads.
+    - **subject_ids** maps each manifest row's key to the ID of its subject,
+      for the rows created or linked by this run.
+    - **skipped** is the number of rows which the journal shows were already
+      done.
+    - **failed** is a list of ``(key, exception)`` tuples for rows which
+      couldn't be created or linked. Running the ingest again with the same
+      journal retries them.
+    """
+
+    def __init__(self):
+        self.stages = {
+            name: StageStats(name) for name in ('create', 'upload', 'link')
+        }
+        self.subject_ids = {}
+        self.skipped = 0
+        self.failed = []
+        self._lock = threading.Lock()
+
+    def add_failure(self, key, exception):
+        with self._lock:
+            self.failed.append((key, exception))
+
+    def __repr__(self):
+        return '<IngestResult {} created, {} linked, {} skipped, {} failed>'.format(
+            self.stages['create'].count,
+            self.stages['link'].count,
+            self.skipped,
+            len(self.failed),
+        )
+
+
+class IngestJournal(object):
+    """
+    A local file recording the progress of :py:meth:`.SubjectSet.ingest`, so
+    that an interrupted ingest can be resumed without creating subjects
+    twice. Each line is a JSON record of a subject being created, its media
+    being uploaded, or a batch of rows being linked. A subject is recorded as
+    created as soon as it exists, before its media is uploaded, so a resumed
+    ingest uploads the media again rather than creating another subject. An
+    incomplete last line, left by a crash, is removed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.created = {}
+        self.uploaded = set()
+        self.linked = set()
+        self._lock = threading.Lock()
+
+        for record in read_json_lines(path):
+            if 'created' in record:
+                self.created[record['created']] = record['subject']
+            elif 'uploaded' in record:
+                self.uploaded.add(record['uploaded'])
+            else:
+                self.linked.update(record.get('linked', []))
+
+        self._file = open(path, 'a')
+
+    def record_created(self, key, subject_id):
+        self._write({'created': key, 'subject': subject_id})
+
+    def record_uploaded(self, key):
+        self._write({'uploaded': key})
+
+    def record_linked(self, keys):
+        self._write({'linked': keys})
+
+    def _write(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_manifest(manifest):
+    """
+    Yields each row of **manifest**, which is either the path to a CSV file
+    with a header row, or an iterable of :py:class:`dict`.
+    """
+    if not isinstance(manifest, str):
+        for row in manifest:
+            yield row
+        return
+
+    with open(manifest, newline='') as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def ingest(
+    subject_set,
+    manifest,
+    journal=None,
+    location_columns=('location',),
+    key_column=None,
+    max_workers=ASYNC_SAVE_THREADS,
+    max_uploads=None,
+    link_batch_size=INGEST_LINK_BATCH_SIZE,
+    media_index=None,
+    client=None,
+):
+    """
+    Implements :py:meth:`.SubjectSet.ingest`.
+    """
+    if not client:
+        client = Panoptes.client()
+
+    result = IngestResult()
+    close_journal = False
+    if journal is not None and not isinstance(journal, IngestJournal):
+        journal = IngestJournal(journal)
+        close_journal = True
+    close_media_index = False
+    if media_index is not None and not isinstance(media_index, MediaIndex):
+        media_index = MediaIndex(media_index)
+        close_media_index = True
+
+    with client:
+        subject_set.reload()
+        project_id = subject_set.raw['links']['project']
+
+    to_link = queue.Queue()
+
+    def create(key, row, subject_id=None):
+        try:
+            with client:
+                started = time.monotonic()
+                if subject_id is None:
+                    subject = Subject()
+                    subject.links.project = project_id
+                else:
+                    # Created by an earlier run whose uploads didn't finish.
+                    # Setting the locations again gets new upload URLs.
+                    subject = Subject.find(subject_id)
+                    subject.locations = []
+                    subject._media_files = []
+                    subject.modified_attributes.add('locations')
+                for column, value in row.items():
+                    if column in location_columns:
+                        if value:
+                            subject.add_location(
+                                value,
+                                media_index=media_index,
+                            )
+                    elif column != key_column:
+                        subject.metadata[column] = value
+                subject._save(
+                    client,
+                    timed_upload,
+                    on_saved=lambda subject: record_created(key, subject),
+                )
+                result.stages['create'].record(started, time.monotonic())
+        except Exception as e:
+            logger.debug('Failed to create subject for row %s: %s', key, e)
+            result.add_failure(key, e)
+            return
+
+        if journal is not None:
+            journal.record_uploaded(key)
+        to_link.put((key, subject.id))
+
+    def record_created(key, subject):
+        if journal is not None and key not in journal.created:
+            journal.record_created(key, subject.id)
+
+    def upload(fn, *args, **kwargs):
+        started = time.monotonic()
+        response = fn(*args, **kwargs)
+        result.stages['upload'].record(started, time.monotonic())
+        return response
+
+    def timed_upload(fn, *args, **kwargs):
+        return executor.upload(upload, fn, *args, **kwargs)
+
+    def link_batch(batch):
+        keys = [key for key, _ in batch]
+        try:
+            with client:
+                started = time.monotonic()
+                subject_set.links.subjects.add(
+                    [subject_id for _, subject_id in batch]
+                )
+                result.stages['link'].record(
+                    started,
+                    time.monotonic(),
+                    count=len(batch),
+                )
+        except Exception as e:
+            logger.debug('Failed to link rows %s: %s', keys, e)
+            for key in keys:
+                result.add_failure(key, e)
+            return
+
+        if journal is not None:
+            journal.record_linked(keys)
+        for key, subject_id in batch:
+            result.subject_ids[key] = subject_id
+
+    def link():
+        batch = []
+        while True:
+            item = to_link.get()
+            if item is not None:
+                batch.append(item)
+            if batch and (item is None or len(batch) >= link_batch_size):
+                link_batch(batch)
+                batch = []
+            if item is None:
+                return
+
+    linker = threading.Thread(target=link)
+    linker.start()
+
+    executor = AsyncSaveExecutor(
+        max_workers=max_workers,
+        max_uploads=max_uploads,
+    )
+    client.set_upload_pool_size(executor.upload_pool_size)
+    try:
+        for i, row in enumerate(read_manifest(manifest)):
+            if key_column:
+                key = row[key_column]
+            else:
+                key = str(i + 1)
+
+            if journal is not None:
+                if key in journal.linked:
+                    result.skipped += 1
+                    continue
+                if key in journal.uploaded:
+                    to_link.put((key, journal.created[key]))
+                    continue
+
+            # Blocks while the executor's queue is full
+            executor.submit(
+                create,
+                key,
+                row,
+                journal.created.get(key) if journal is not None else None,
+            )
+    finally:
+        executor.shutdown(wait=True)
+        to_link.put(None)
+        linker.join()
+        if close_journal:
+            journal.close()
+        if close_media_index:
+            media_index.close()
+
+    for stage in result.stages.values():
+        logger.info('Ingest %r', stage)
+    return result
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from panoptes_client.utils import read_json_lines
+
+# Number of bytes written to a partial download at a time
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class MediaCache(object):
+    """
+    A local, content-addressed cache of downloaded subject media. Pass one
+    (or the path to its directory) to :py:meth:`.Subject.download_locations`
+    or :py:meth:`.Subject.download_many`.
+
+    Each file is stored once, named by the SHA-256 hash of its content, in
+    ``objects/`` under **directory**, however many URLs it was downloaded
+    from. The URLs which have been downloaded are recorded in ``index`` as
+    JSON lines, so they're skipped if they're requested again. Downloads are
+    written to ``partial/`` first; if one is interrupted, the next attempt
+    continues from where it stopped, if the server supports range requests.
+
+    Examples::
+
+        cache = MediaCache('media')
+        for path in subject.download_locations(cache):
+            print(path)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._url_locks = {}
+
+        for name in ('objects', 'partial'):
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+        index_path = os.path.join(directory, 'index')
+        for entry in read_json_lines(index_path):
+            self._entries[entry['url']] = entry
+
+        self._file = open(index_path, 'a')
+
+    @staticmethod
+    def _key(url):
+        # Signed URLs are cached without their signature
+        return urlunsplit(urlsplit(url)._replace(query=''))
+
+    def object_path(self, content_hash):
+        """
+        Returns the path of the cached file with the given SHA-256 hash.
+        """
+        return os.path.join(
+            self.directory,
+            'objects',
+            content_hash[:2],
+            content_hash,
+        )
+
+    def get(self, url):
+        """
+        Returns the path of the cached file downloaded from **url**, or
+        ``None`` if it isn't in the cache.
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(url))
+        if entry is None:
+            return None
+        path = self.object_path(entry['sha256'])
+        if not os.path.exists(path):
+            return None
+        return path
+
+    def download(self, url, session=None):
+        """
+        Downloads **url** into the cache, unless it's already there.
+
+        Returns a tuple of the cached file's path and the number of bytes
+        downloaded, which is ``None`` if the file was already cached. Raises
+        :py:class:`requests.exceptions.RequestException` if the download
+        fails, leaving the partial download to be continued by the next
+        attempt.
+        """
+        key = self._key(url)
+        with self._lock:
+            url_lock = self._url_locks.setdefault(key, threading.Lock())
+
+        # Only one thread downloads each URL, and the others wait for it
+        with url_lock:
+            path = self.get(url)
+            if path is not None:
+                return path, None
+
+            content_hash, size, downloaded = self._fetch(
+                url,
+                session or requests,
+                os.path.join(
+                    self.directory,
+                    'partial',
+                    hashlib.sha256(key.encode()).hexdigest(),
+                ),
+            )
+            path = self._store(key, content_hash, size)
+
+        with self._lock:
+            self._url_locks.pop(key, None)
+        return path, downloaded
+
+    def _fetch(self, url, session, partial_path):
+        offset = 0
+        if os.path.exists(partial_path):
+            offset = os.path.getsize(partial_path)
+
+        headers = {}
+        if offset:
+            headers['Range'] = 'bytes={}-'.format(offset)
+
+        digest = hashlib.sha256()
+        downloaded = 0
+        with session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416:
+                # The partial file doesn't match the remote file
+                os.remove(partial_path)
+            response.raise_for_status()
+
+            if offset and response.status_code == 206:
+                with open(partial_path, 'rb') as f:
+                    for chunk in iter(
+                        lambda: f.read(DOWNLOAD_CHUNK_SIZE),
+                        b'',
+                    ):
+                        digest.update(chunk)
+                mode = 'ab'
+            else:
+                offset = 0
+                mode = 'wb'
+
+            with open(partial_path, mode) as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    downloaded += len(chunk)
+
+        content_hash = digest.hexdigest()
+        os.makedirs(
+            os.path.dirname(self.object_path(content_hash)),
+            exist_ok=True,
+        )
+        os.replace(partial_path, self.object_path(content_hash))
+        return content_hash, offset + downloaded, downloaded
+
+    def _store(self, key, content_hash, size):
+        entry = {'url': key, 'sha256': content_hash, 'size': size}
+        with self._lock:
+            self._entries[key] = entry
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+        return self.object_path(content_hash)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self._file.close()
+
+
+class DownloadResult(object):
+    """
+    Returned by :py:meth:`.Subject.download_many`.
+
+    - **paths** maps each subject's ID to a list of the cached paths of its
+      locations, in order. The path is ``None`` for any which failed.
+    - **downloaded** is the number of files downloaded, and
+      **bytes_downloaded** their total size.
+    - **skipped** is the number of files which were already cached.
+    - **failed** is a list of ``(subject_id, url, exception)`` tuples for
+      files which couldn't be downloaded. The URL is ``None`` for subjects
+      which couldn't be found.
+    - **elapsed** is the number of seconds the downloads took, and
+      **rate** the number of bytes downloaded per second.
+    """
+
+    def __init__(self):
+        self.paths = {}
+        self.downloaded = 0
+        self.bytes_downloaded = 0
+        self.skipped = 0
+        self.failed = []
+        self.started = time.monotonic()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def add(self, subject_id, index, path, downloaded):
+        with self._lock:
+            self.paths[subject_id][index] = path
+            if downloaded is None:
+                self.skipped += 1
+            else:
+                self.downloaded += 1
+                self.bytes_downloaded += downloaded
+
+    def add_failure(self, subject_id, url, exception):
+        with self._lock:
+            self.failed.append((subject_id, url, exception))
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        if not elapsed:
+            return 0
+        return self.bytes_downloaded / elapsed
+
+    def __repr__(self):
+        return (
+            '<DownloadResult {} downloaded, {} skipped, {} failed; '
+            '{:.1f} MB at {:.1f} MB/s>'
+        ).format(
+            self.downloaded,
+            self.skipped,
+            len(self.failed),
+            self.bytes_downloaded / 1e6,
+            self.rate / 1e6,
+        )
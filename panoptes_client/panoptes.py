@@ -1,27 +1,45 @@
 from builtins import str
 
+import functools
 import getpass
+import json
 import logging
 import os
 import requests
 import threading
+import time
 import importlib.metadata
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from datetime import datetime, timedelta
 from redo import retrier
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
 
 import six
 
-from panoptes_client.utils import isiterable, batchable
+from panoptes_client.utils import (
+    MAX_ID_LIST_LENGTH,
+    batchable,
+    isiterable,
+)
 
 HTTP_RETRY_LIMIT = 5
 RETRY_BACKOFF_INTERVAL = 5
 
+# Connections kept alive to each media upload host, at least. Raised by
+# Panoptes.set_upload_pool_size to match the number of concurrent uploads.
+UPLOAD_POOL_SIZE = 10
+
 if os.environ.get('PANOPTES_DEBUG'):
     logging.basicConfig(level=logging.DEBUG)
 else:
     logging.basicConfig(level=logging.INFO)
 
+logger = logging.getLogger('panoptes_client')
+
 
 class Panoptes(object):
     """
@@ -84,7 +102,8 @@ class Panoptes(object):
     @classmethod
     def connect(cls, *args, **kwargs):
         """
-        connect(username=None, password=None, endpoint=None, admin=False)
+        connect(username=None, password=None, endpoint=None, admin=False,
+                object_cache=None, reload_after_save=True)
 
         Configures the Panoptes client for use.
 
@@ -101,17 +120,51 @@ class Panoptes(object):
           trailing slash.
         - **admin** is a boolean, switching on admin mode if ``True``. Has no
           effect if the given username is not a Zooniverse.org administrator.
+        - **object_cache** is an optional :py:class:`.ObjectCache`. If given,
+          objects fetched with this client are shared through the cache
+          rather than being re-fetched from the API every time.
+        - **reload_after_save** is a boolean. By default, objects are reloaded
+          from the API the next time they're accessed after they've been
+          updated. If ``False``, the API's response to the update is trusted
+          as the object's new state instead, saving a request per update.
 
 
         Examples::
 
             Panoptes.connect(username='example', password='example')
             Panoptes.connect(endpoint='https://panoptes.example.com')
+            Panoptes.connect(object_cache=ObjectCache(max_size=10000, ttl=300))
         """
         cls._local.panoptes_client = cls(*args, **kwargs)
         cls._local.panoptes_client.login()
         return cls._local.panoptes_client
 
+    @classmethod
+    def bulk(cls, max_workers=5, conflict_retries=3):
+        """
+        Returns a :py:class:`.BulkSave` context manager which collects objects
+        saved inside the `with` block and saves them concurrently when the
+        block exits, using the current client::
+
+            with Panoptes.bulk(max_workers=10) as bulk:
+                for subject in subject_set.subjects:
+                    subject.metadata['checked'] = True
+                    subject.save()
+
+            for result in bulk.failed:
+                print(result.object, result.exception)
+
+        - **max_workers** is the maximum number of concurrent saves.
+        - **conflict_retries** is the number of times an object is reloaded
+          and its changes re-applied if it was modified on the API since it
+          was loaded.
+        """
+        return BulkSave(
+            cls.client(),
+            max_workers=max_workers,
+            conflict_retries=conflict_retries,
+        )
+
     @classmethod
     def client(cls, *args, **kwargs):
         local_client = getattr(cls._local, "panoptes_client", None)
@@ -128,9 +181,16 @@ class Panoptes(object):
         username=None,
         password=None,
         login=None,
-        admin=False
+        admin=False,
+        object_cache=None,
+        reload_after_save=True,
     ):
         self.session = requests.session()
+        self._upload_sessions = {}
+        self._upload_sessions_lock = threading.Lock()
+        self._upload_pool_size = UPLOAD_POOL_SIZE
+        self.object_cache = object_cache
+        self.reload_after_save = reload_after_save
 
         self.endpoint = endpoint or os.environ.get(
             'PANOPTES_ENDPOINT',
@@ -174,6 +234,56 @@ class Panoptes(object):
     def __exit__(self, *exc):
         self._local.panoptes_client = self._local.previous_client
 
+    def upload_session(self, url):
+        """
+        Returns a :py:class:`requests.Session` for uploading media to the
+        host in **url**, such as a signed blob storage URL returned by the
+        API. One session is kept per host, with enough connections kept
+        alive for the concurrent uploads (see :py:meth:`set_upload_pool_size`),
+        so repeated uploads don't each open a new connection. These sessions
+        don't send this client's credentials.
+        """
+        parsed = urlparse(url)
+        host = '{}://{}'.format(parsed.scheme, parsed.netloc)
+        with self._upload_sessions_lock:
+            session = self._upload_sessions.get(host)
+            if session is None:
+                session = self._new_upload_session(host)
+                self._upload_sessions[host] = session
+        return session
+
+    def set_upload_pool_size(self, size):
+        """
+        Keeps at least **size** connections alive to each upload host, so
+        that **size** concurrent uploads can reuse their connections. It's
+        called with the number of upload threads by
+        :py:meth:`.Subject.async_saves` and the other bulk upload and download
+        methods. The pool only grows; a smaller **size** is ignored.
+
+        Sessions which may be in use aren't changed. Each host gets a new
+        session with a larger pool, and the old ones are closed. Uploads
+        still running on an old session finish, and their connections are
+        then discarded.
+        """
+        with self._upload_sessions_lock:
+            if size <= self._upload_pool_size:
+                return
+            self._upload_pool_size = size
+            old_sessions = list(self._upload_sessions.values())
+            for host in list(self._upload_sessions):
+                self._upload_sessions[host] = self._new_upload_session(host)
+        for session in old_sessions:
+            session.close()
+
+    def _new_upload_session(self, host):
+        # Callers must hold self._upload_sessions_lock
+        session = requests.Session()
+        session.mount(host, HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self._upload_pool_size,
+        ))
+        return session
+
     def http_request(
         self,
         method,
@@ -277,14 +387,18 @@ class Panoptes(object):
             json_response = None
         else:
             json_response = response.json()
+            if response.status_code in (409, 412):
+                exception_class = ObjectConflictException
+            else:
+                exception_class = PanoptesAPIException
             if 'errors' in json_response:
-                raise PanoptesAPIException(', '.join(
+                raise exception_class(', '.join(
                     map(lambda e: e.get('message', ''),
                         json_response['errors']
                        )
                 ))
             elif 'error' in json_response:
-                raise PanoptesAPIException(json_response['error'])
+                raise exception_class(json_response['error'])
 
         return (json_response, response.headers.get('ETag'))
 
@@ -588,6 +702,299 @@ class Panoptes(object):
     def has_bearer_token(self):
         return self.bearer_token is not None
 
+class ObjectCache(object):
+    """
+    An identity map which holds one canonical instance of each
+    :py:class:`PanoptesObject` per class and ID. Pass an instance to
+    :py:class:`Panoptes` (or :py:meth:`Panoptes.connect`) to enable it for
+    that client::
+
+        cache = ObjectCache(max_size=10000, ttl=300)
+        Panoptes.connect(username='example', password='example',
+                         object_cache=cache)
+
+        Workflow.find(1234) is Workflow.find(1234)  # True, one request
+
+    When enabled, :py:meth:`PanoptesObject.find`, results yielded by
+    :py:meth:`PanoptesObject.where` and lazy loads of objects created from an
+    ID are all served from the cache. Saving an object updates its entry and
+    deleting an object removes it.
+
+    - **max_size** is the maximum number of objects to hold. The least
+      recently used objects are evicted first. ``None`` means no limit.
+    - **ttl** is the number of seconds after which a cached object is
+      considered stale and will be fetched again. ``None`` means objects
+      never expire.
+    """
+
+    def __init__(self, max_size=1000, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._objects = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(object_class, _id):
+        return (object_class, str(_id))
+
+    def get(self, object_class, _id):
+        """
+        Returns the cached instance of **object_class** with the given ID, or
+        ``None`` if there isn't one or it has expired.
+        """
+        if not _id:
+            return None
+        key = self._key(object_class, _id)
+        with self._lock:
+            entry = self._objects.get(key)
+            if entry is None:
+                return None
+            obj, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._objects[key]
+                return None
+            self._objects.move_to_end(key)
+            return obj
+
+    def add(self, obj):
+        """
+        Adds (or replaces) the canonical instance for the given object's class
+        and ID. Objects without an ID are ignored.
+        """
+        if not obj.id:
+            return
+        key = self._key(obj.__class__, obj.id)
+        expires = None
+        if self.ttl is not None:
+            expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._objects[key] = (obj, expires)
+            self._objects.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._objects) > self.max_size:
+                    self._objects.popitem(last=False)
+
+    def invalidate(self, object_class=None, _id=None):
+        """
+        Removes objects from the cache.
+
+        - With no arguments, the whole cache is cleared.
+        - With only **object_class**, all objects of that class are removed.
+        - With both arguments, only the matching object is removed.
+        """
+        with self._lock:
+            if object_class is None:
+                self._objects.clear()
+            elif _id is None:
+                for key in [
+                    key for key in self._objects if key[0] is object_class
+                ]:
+                    del self._objects[key]
+            else:
+                self._objects.pop(self._key(object_class, _id), None)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        return self.get(obj.__class__, obj.id) is obj
+
+
+class BulkSaveResult(object):
+    """
+    The outcome of saving one object in a :py:class:`BulkSave`.
+
+    - **object** is the :py:class:`PanoptesObject` which was saved.
+    - **exception** is the exception raised while saving it, or ``None``.
+    - **conflicts** is the number of times the object had to be reloaded
+      because it was modified on the API by someone else.
+    """
+
+    def __init__(self, obj):
+        self.object = obj
+        self.exception = None
+        self.conflicts = 0
+
+    @property
+    def succeeded(self):
+        return self.exception is None
+
+    def __repr__(self):
+        if self.succeeded:
+            return '<BulkSaveResult {!r} saved>'.format(self.object)
+        return '<BulkSaveResult {!r} failed: {!r}>'.format(
+            self.object,
+            self.exception,
+        )
+
+
+class BulkSave(object):
+    """
+    A unit of work which saves many :py:class:`PanoptesObject` at once. Use
+    :py:meth:`Panoptes.bulk` to create one.
+
+    Inside the `with` block, calling ``save()`` on an object (or passing it
+    to :py:meth:`add`) queues it instead of saving it straight away. When the
+    block exits, queued objects are saved concurrently. Objects which fail to
+    save with an :py:class:`ObjectConflictException` are reloaded, have the
+    keys which were changed locally re-applied, and are saved again.
+
+    Failures don't raise an exception; check **results**, **succeeded** and
+    **failed** after the block. If the block itself raises, nothing is saved.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def current(cls):
+        """
+        Returns the :py:class:`BulkSave` whose block is currently active in
+        this thread, or ``None``.
+        """
+        return getattr(cls._local, 'bulk_save', None)
+
+    def __init__(self, client, max_workers=5, conflict_retries=3):
+        self.client = client
+        self.max_workers = max_workers
+        self.conflict_retries = conflict_retries
+        self.results = []
+        self._queue = OrderedDict()
+
+    def __enter__(self):
+        self._previous = BulkSave.current()
+        BulkSave._local.bulk_save = self
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        BulkSave._local.bulk_save = self._previous
+        if exc_type is None:
+            self.flush()
+
+    def add(self, obj):
+        """
+        Queues **obj** to be saved when the block exits. Adding the same
+        object more than once only saves it once.
+        """
+        self._queue[id(obj)] = obj
+
+    def flush(self):
+        """
+        Saves every queued object and returns the list of
+        :py:class:`BulkSaveResult` for them, which is also added to
+        **results**.
+        """
+        objects = list(self._queue.values())
+        self._queue.clear()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._save, objects))
+        self.results.extend(results)
+        return results
+
+    @property
+    def succeeded(self):
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.succeeded]
+
+    def _save(self, obj):
+        result = BulkSaveResult(obj)
+        with self.client:
+            while True:
+                try:
+                    obj.save()
+                    return result
+                except ObjectConflictException as e:
+                    if result.conflicts >= self.conflict_retries:
+                        result.exception = e
+                        return result
+                    result.conflicts += 1
+                    self._reapply_changes(obj)
+                except Exception as e:
+                    result.exception = e
+                    return result
+
+    def _reapply_changes(self, obj):
+        # Only the changed keys are replayed onto the reloaded object, so
+        # that changes made elsewhere to other keys of the same attribute
+        # aren't overwritten with stale values
+        modified_attributes = set(obj.modified_attributes)
+        modified_paths = set(obj.modified_paths)
+        changes = [
+            _changed_value(obj.raw, path)
+            for path in sorted(modified_paths, key=len)
+        ]
+
+        if self.client.object_cache is not None:
+            self.client.object_cache.invalidate(obj.__class__, obj.id)
+        obj.reload()
+
+        for path, value in changes:
+            _replay_change(obj.raw, path, value)
+        obj.modified_attributes = modified_attributes
+        obj.modified_paths = modified_paths
+
+
+# Marks a key which was deleted locally
+_DELETED = object()
+
+
+def _changed_value(raw, path):
+    """
+    Returns ``(path, value)`` for a path in ``modified_paths``, where
+    **value** is a copy of the value at **path** in **raw**, or
+    :py:data:`_DELETED`. Paths into lists are cut short at the list, since
+    list changes can only be replayed by replacing the whole list.
+    """
+    value = raw
+    for i, key in enumerate(path):
+        if isinstance(value, list):
+            path = path[:i]
+            break
+        if not isinstance(value, dict) or key not in value:
+            return path, _DELETED
+        value = dict.__getitem__(value, key)
+    if isinstance(value, LinkCollection):
+        return path, value
+    return path, deepcopy(value)
+
+
+def _replay_change(raw, path, value):
+    """
+    Sets the key at **path** in **raw** to **value**, creating any missing
+    parent dicts, or deletes it if **value** is :py:data:`_DELETED`.
+    """
+    for key in path[:-1]:
+        child = raw.get(key)
+        if not isinstance(child, dict):
+            child = {}
+            raw[key] = child
+        raw = child
+    if value is _DELETED:
+        raw.pop(path[-1], None)
+    else:
+        raw[path[-1]] = value
+
+
+def _detached_raw(raw):
+    """
+    Returns a deep copy of another object's **raw**, so that changes to one
+    object don't show up in the other. Linked collections are copied as
+    lists of IDs, since a :py:class:`LinkCollection` belongs to its parent.
+    """
+    raw = dict(raw)
+    links = raw.get('links')
+    if isinstance(links, dict):
+        links = dict(links)
+        for name, value in links.items():
+            if isinstance(value, LinkCollection):
+                with value._lock:
+                    links[name] = list(value._ordered_ids())
+        raw['links'] = links
+    return deepcopy(raw)
+
+
 class PanoptesObject(object):
     """
     The base class of all Panoptes model classes. You should never need to
@@ -602,6 +1009,10 @@ class PanoptesObject(object):
         print(project.display_name)
 
     This will not make any HTTP requests until the `print` statement.
+
+    Changes made in place to editable dict and list attributes, such as
+    ``subject.metadata['key'] = 'value'``, are tracked automatically and will
+    be submitted by :py:meth:`save`.
     """
 
     RESERVED_ATTRIBUTES = (
@@ -609,6 +1020,7 @@ class PanoptesObject(object):
         'etag',
         'links',
         'modified_attributes',
+        'modified_paths',
         'raw',
     )
 
@@ -669,9 +1081,20 @@ class PanoptesObject(object):
         And this would yield all launch approved :py:class:`.Project`::
 
             Project.where(launch_approved=True)
+
+        Pass ``compact=True`` to have the generator yield read-only
+        :py:class:`.CompactPanoptesObject` instances instead, which use far
+        less memory when scanning large numbers of objects::
+
+            for subject in Subject.where(subject_set_id=1234, compact=True):
+                print(subject.id, subject.metadata)
         """
         _id = kwargs.pop('id', '')
-        return cls.paginated_results(*cls.http_get(_id, params=kwargs))
+        compact = kwargs.pop('compact', False)
+        return cls.paginated_results(
+            *cls.http_get(_id, params=kwargs),
+            compact=compact
+        )
 
     @classmethod
     def find(cls, _id):
@@ -683,6 +1106,9 @@ class PanoptesObject(object):
 
         if not _id:
             return None
+        cached_object = cls._cached(_id)
+        if cached_object is not None:
+            return cached_object
         try:
             return next(cls.where(id=_id))
         except StopIteration:
@@ -691,8 +1117,18 @@ class PanoptesObject(object):
             )
 
     @classmethod
-    def paginated_results(cls, response, etag):
-        return ResultPaginator(cls, response, etag)
+    def _cached(cls, _id):
+        object_cache = Panoptes.client().object_cache
+        if object_cache is None:
+            return None
+        cached_object = object_cache.get(cls, _id)
+        if cached_object is not None and cached_object._loaded:
+            return cached_object
+        return None
+
+    @classmethod
+    def paginated_results(cls, response, etag, compact=False):
+        return ResultPaginator(cls, response, etag, compact=compact)
 
     def __init__(self, raw={}, etag=None):
         self._loaded = False
@@ -707,13 +1143,13 @@ class PanoptesObject(object):
     def __getattr__(self, name):
         try:
             if (
-                name not in PanoptesObject.RESERVED_ATTRIBUTES
+                not self._loaded
                 and name != 'id'
-                and not self._loaded
+                and name not in PanoptesObject.RESERVED_ATTRIBUTES
             ):
                 self.reload()
                 return getattr(self, name)
-            return self.raw[name]
+            value = self.raw[name]
         except KeyError:
             if name == 'id':
                 return None
@@ -722,6 +1158,17 @@ class PanoptesObject(object):
                 name
             ))
 
+        # Editable dicts and lists are wrapped on first access, so that
+        # in-place changes mark the attribute as modified without needing a
+        # snapshot of the original value.
+        if (
+            isinstance(value, (dict, list))
+            and name in self._attribute_schema().editable
+        ):
+            value = track_changes(value, self, (name,))
+            self.raw[name] = value
+        return value
+
     def __setattr__(self, name, value):
         if name in PanoptesObject.RESERVED_ATTRIBUTES:
             return super(PanoptesObject, self).__setattr__(name, value)
@@ -732,13 +1179,14 @@ class PanoptesObject(object):
         if name not in self.raw:
             return super(PanoptesObject, self).__setattr__(name, value)
 
-        if name not in self._edit_attributes:
+        if name not in self._attribute_schema().editable:
             raise ReadOnlyAttributeException(
                 '{} is read-only'.format(name)
             )
 
         self.raw[name] = value
         self.modified_attributes.add(name)
+        self.modified_paths.add((name,))
 
     def __repr__(self):
         return '<{} {}>'.format(
@@ -747,79 +1195,115 @@ class PanoptesObject(object):
         )
 
     def set_raw(self, raw, etag=None, loaded=True):
-        self.raw = {}
-        self.raw.update(self._savable_dict(include_none=True))
+        self.raw = self._attribute_schema().new_raw()
         self.raw.update(raw)
         self.etag = etag
         self.modified_attributes = set()
+        self.modified_paths = set()
 
         self._loaded = loaded
 
+    @classmethod
+    def _attribute_schema(cls):
+        # Look in the class's own __dict__ so subclasses with different
+        # _edit_attributes don't pick up their parent's schema.
+        schema = cls.__dict__.get('_compiled_attribute_schema')
+        if schema is None:
+            schema = AttributeSchema(cls._edit_attributes)
+            cls._compiled_attribute_schema = schema
+        return schema
+
     def _savable_dict(
         self,
         attributes=None,
         modified_attributes=None,
         include_none=False,
     ):
-        if not attributes:
-            attributes = self._edit_attributes
-        out = []
-        for key in attributes:
-            if type(key) == dict:
-                for subkey, subattributes in key.items():
-                    if (
-                        subkey == 'links' and
-                        hasattr(self, 'links') and
-                        modified_attributes and
-                        'links' in modified_attributes
-                    ):
-                        out.append(
-                            (subkey, self.links._savable_dict(subattributes))
-                        )
-                    else:
-                        links_out = (subkey, self._savable_dict(
-                            attributes=subattributes,
-                            include_none=include_none
-                        ))
-                        if links_out[1]:
-                            out.append(links_out)
-            elif modified_attributes and key not in modified_attributes:
+        if attributes:
+            schema = AttributeSchema(attributes)
+        else:
+            schema = self._attribute_schema()
+        return self._schema_dict(schema, modified_attributes, include_none)
+
+    def _schema_dict(self, schema, modified_attributes, include_none):
+        out = {}
+        raw = self.raw
+        for key in schema.keys:
+            if modified_attributes and key not in modified_attributes:
                 continue
+            value = raw.get(key)
+            if value is not None or include_none:
+                out[key] = value
+        for subkey, subschema in schema.nested:
+            if (
+                subkey == 'links' and
+                modified_attributes and
+                'links' in modified_attributes
+            ):
+                out[subkey] = self.links._savable_dict(subschema.editable)
             else:
-                value = self.raw.get(key)
-                if value is not None or include_none:
-                    out.append((key, value))
-        return dict(out)
+                sub_out = self._schema_dict(subschema, None, include_none)
+                if sub_out:
+                    out[subkey] = sub_out
+        return out
 
     def save(self):
         """
         Saves the object. If the object has not been saved before (i.e. it's
         new), then a new object is created. Otherwise, any changes are
         submitted to the API.
+
+        Inside a :py:meth:`Panoptes.bulk` block, the object is queued and
+        saved when the block exits instead.
+
+        After an update, the object will be reloaded from the API the next
+        time it's accessed, unless the client was created with
+        ``reload_after_save=False``, in which case the updated resource
+        returned by the API is used as-is.
         """
 
+        bulk_save = BulkSave.current()
+        if bulk_save is not None:
+            bulk_save.add(self)
+            return
+
+        client = Panoptes.client()
         if not self.id:
-            save_method = Panoptes.client().post
+            save_method = client.post
             force_reload = False
         else:
             if not self.modified_attributes:
                 return
             if not self._loaded:
                 self.reload()
-            save_method = Panoptes.client().put
-            force_reload = True
+            save_method = client.put
+            force_reload = client.reload_after_save
+
+        payload = self._savable_dict(
+            modified_attributes=self.modified_attributes
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Saving {} {}: {} bytes, changed {}'.format(
+                    self.__class__.__name__,
+                    self.id,
+                    len(json.dumps(payload)),
+                    sorted(self.modified_paths, key=repr),
+                )
+            )
 
         response, response_etag = save_method(
             self.url(self.id),
-            json={self._api_slug: self._savable_dict(
-                modified_attributes=self.modified_attributes
-            )},
+            json={self._api_slug: payload},
             etag=self.etag
         )
 
         raw_resource_response = response[self._api_slug][0]
         self.set_raw(raw_resource_response, response_etag)
 
+        if client.object_cache is not None:
+            client.object_cache.add(self)
+
         if force_reload:
             self._loaded = False
 
@@ -833,11 +1317,36 @@ class PanoptesObject(object):
 
         if not self.id:
             return
-        reloaded_object = self.__class__.find(self.id)
-        self.set_raw(
-            reloaded_object.raw,
-            reloaded_object.etag
-        )
+
+        object_cache = Panoptes.client().object_cache
+        if object_cache is not None:
+            cached_object = object_cache.get(self.__class__, self.id)
+            if (
+                cached_object is not None
+                and cached_object is not self
+                and cached_object._loaded
+            ):
+                self.set_raw(
+                    _detached_raw(cached_object.raw),
+                    cached_object.etag,
+                )
+                return
+
+        # Fetched directly rather than through find(), so that this object
+        # stays the canonical instance in the cache
+        response, etag = self.http_get(self.id)
+        resources = response.get(self._api_slug) if response else None
+        if not resources:
+            raise PanoptesAPIException(
+                "Could not find {} with id='{}'".format(
+                    self.__class__.__name__,
+                    self.id,
+                )
+            )
+        self.set_raw(resources[0], etag)
+
+        if object_cache is not None:
+            object_cache.add(self)
 
     def delete(self):
         """
@@ -849,14 +1358,319 @@ class PanoptesObject(object):
             return
         if not self._loaded:
             self.reload()
+        object_cache = Panoptes.client().object_cache
+        if object_cache is not None:
+            object_cache.invalidate(self.__class__, self.id)
         return self.http_delete(self.id, etag=self.etag)
 
+
+def track_changes(value, parent, path):
+    """
+    Wraps dicts and lists in :py:class:`ChangeTrackingDict` and
+    :py:class:`ChangeTrackingList` respectively. Other values are returned
+    unchanged.
+
+    - **parent** is the :py:class:`PanoptesObject` to record changes on.
+    - **path** is a tuple of keys leading to **value** from the parent,
+      starting with the attribute name.
+    """
+    if isinstance(value, ChangeTrackingMixin):
+        if value._parent is parent and value._path == path:
+            return value
+    elif type(value) not in (dict, list):
+        return value
+
+    if isinstance(value, dict):
+        return ChangeTrackingDict(value, parent, path)
+    return ChangeTrackingList(value, parent, path)
+
+
+class ChangeTrackingMixin(object):
+    """
+    Common behaviour for :py:class:`ChangeTrackingDict` and
+    :py:class:`ChangeTrackingList`.
+
+    Any modification adds the attribute to the parent object's
+    ``modified_attributes``, and the path of the modified key (or of the
+    list, for list changes) to its ``modified_paths``. Nested dicts and lists
+    are wrapped lazily (as shallow copies) when they're read, so unmodified
+    data is never copied. Anything which hands out nested values, including
+    shallow copies, wraps them first, so that changes made through them are
+    still recorded.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, value, parent, path):
+        self._base.__init__(self, value)
+        self._parent = parent
+        self._path = path
+
+    def _changed(self, path):
+        self._parent.modified_attributes.add(self._path[0])
+        self._parent.modified_paths.add(path)
+
+    def _track(self, key, value):
+        tracked = track_changes(value, self._parent, self._path + (key,))
+        if tracked is not value:
+            self._base.__setitem__(self, key, tracked)
+        return tracked
+
+    def __copy__(self):
+        self._track_all()
+        return self._base(self)
+
+    copy = __copy__
+
+    def __deepcopy__(self, memo):
+        return deepcopy(self._base(self), memo)
+
+    def __reduce__(self):
+        return (self._base, (self._base(self),))
+
+
+def _tracked_reader(base, name):
+    base_method = getattr(base, name)
+
+    @functools.wraps(base_method)
+    def reader(self, *args, **kwargs):
+        self._track_all()
+        return base_method(self, *args, **kwargs)
+    return reader
+
+
+def _tracked_mutator(base, name, keyed=False):
+    base_method = getattr(base, name)
+
+    @functools.wraps(base_method)
+    def mutator(self, *args, **kwargs):
+        if keyed:
+            self._changed(self._path + (args[0],))
+        else:
+            self._changed(self._path)
+        return base_method(self, *args, **kwargs)
+    return mutator
+
+
+class ChangeTrackingDict(ChangeTrackingMixin, dict):
+    """
+    A dict which records in-place modifications on its parent
+    :py:class:`PanoptesObject`. See :py:class:`ChangeTrackingMixin`.
+    """
+
+    __slots__ = ('_parent', '_path')
+    _base = dict
+
+    def __getitem__(self, key):
+        return self._track(key, dict.__getitem__(self, key))
+
+    def __iter__(self):
+        # Overriding this makes dict(tracked) and {**tracked} read the values
+        # through __getitem__, rather than straight from the dict's storage
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return self[key]
+
+    def _track_all(self):
+        for key, value in dict.items(self):
+            self._track(key, value)
+
+    def values(self):
+        self._track_all()
+        return dict.values(self)
+
+    def items(self):
+        self._track_all()
+        return dict.items(self)
+
+
+class ChangeTrackingList(ChangeTrackingMixin, list):
+    """
+    A list which records in-place modifications on its parent
+    :py:class:`PanoptesObject`. See :py:class:`ChangeTrackingMixin`.
+    """
+
+    __slots__ = ('_parent', '_path')
+    _base = list
+
+    def _track_all(self):
+        for i, value in enumerate(list.__iter__(self)):
+            self._track(i, value)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            self._track_all()
+            return list.__getitem__(self, i)
+        return self._track(i, list.__getitem__(self, i))
+
+    def __iter__(self):
+        self._track_all()
+        return list.__iter__(self)
+
+
+for _name in ('__setitem__', '__delitem__', 'pop'):
+    setattr(
+        ChangeTrackingDict,
+        _name,
+        _tracked_mutator(dict, _name, keyed=True),
+    )
+
+for _name in ('__ior__', 'clear', 'popitem', 'update'):
+    setattr(ChangeTrackingDict, _name, _tracked_mutator(dict, _name))
+
+for _name in ('__or__', '__ror__'):
+    setattr(ChangeTrackingDict, _name, _tracked_reader(dict, _name))
+
+for _name in ('__add__', '__mul__', '__rmul__', '__reversed__'):
+    setattr(ChangeTrackingList, _name, _tracked_reader(list, _name))
+
+# Indexes move when lists change, so list changes are recorded against the
+# whole list.
+for _name in (
+    '__setitem__',
+    '__delitem__',
+    '__iadd__',
+    '__imul__',
+    'append',
+    'clear',
+    'extend',
+    'insert',
+    'pop',
+    'remove',
+    'reverse',
+    'sort',
+):
+    setattr(ChangeTrackingList, _name, _tracked_mutator(list, _name))
+
+
+class AttributeSchema(object):
+    """
+    The compiled form of a model class's ``_edit_attributes``, built once per
+    class so that hydrating and saving objects doesn't have to walk the
+    nested attribute definitions every time.
+
+    - **keys** is a tuple of the top-level editable attribute names.
+    - **nested** is a tuple of ``(key, AttributeSchema)`` pairs for nested
+      attribute dicts, such as ``links``.
+    - **editable** is a frozenset of **keys**, for fast membership tests.
+    """
+
+    def __init__(self, edit_attributes):
+        keys = []
+        nested = []
+        for key in edit_attributes:
+            if type(key) == dict:
+                for subkey, subattributes in key.items():
+                    nested.append((subkey, AttributeSchema(subattributes)))
+            else:
+                keys.append(key)
+        self.keys = tuple(keys)
+        self.nested = tuple(nested)
+        self.editable = frozenset(keys)
+
+    def new_raw(self):
+        """
+        Returns a new dict with every editable attribute set to ``None``.
+        Nested dicts are only included if they contain any attributes.
+        """
+        raw = dict.fromkeys(self.keys)
+        for subkey, subschema in self.nested:
+            sub_raw = subschema.new_raw()
+            if sub_raw:
+                raw[subkey] = sub_raw
+        return raw
+
+
+class CompactPanoptesObject(object):
+    """
+    A read-only, memory efficient representation of a
+    :py:class:`PanoptesObject`, yielded by
+    :py:meth:`PanoptesObject.where` when called with ``compact=True``.
+
+    Instances have no per-object ``__dict__``, don't pre-populate editable
+    attributes, don't take snapshots of nested attributes, and only create a
+    :py:class:`LinkResolver` when ``links`` is first accessed. Attributes are
+    read directly from the API response::
+
+        for subject in Subject.where(subject_set_id=1234, compact=True):
+            print(subject.metadata)
+            print(subject.links.project)
+
+    Attempting to modify an attribute raises
+    :py:class:`ReadOnlyAttributeException`. Use :py:meth:`materialize` to get
+    a full, editable :py:class:`PanoptesObject`.
+    """
+
+    __slots__ = ('object_class', 'raw', 'etag', '_links')
+
+    _loaded = True
+
+    def __init__(self, object_class, raw, etag=None):
+        object.__setattr__(self, 'object_class', object_class)
+        object.__setattr__(self, 'raw', raw)
+        object.__setattr__(self, 'etag', etag)
+        object.__setattr__(self, '_links', None)
+
+    def __getattr__(self, name):
+        try:
+            return self.raw[name]
+        except KeyError:
+            if name == 'id':
+                return None
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.object_class.__name__,
+                name
+            ))
+
+    def __setattr__(self, name, value):
+        raise ReadOnlyAttributeException(
+            '{} is read-only'.format(name)
+        )
+
+    def __repr__(self):
+        return '<{} {}>'.format(
+            self.object_class.__name__,
+            self.id
+        )
+
+    @property
+    def links(self):
+        if self._links is None:
+            object.__setattr__(self, '_links', LinkResolver(self))
+        return self._links
+
+    @property
+    def _link_collection(self):
+        return getattr(self.object_class, '_link_collection', LinkCollection)
+
+    def materialize(self):
+        """
+        Returns a full :py:class:`PanoptesObject` of the original class,
+        which can be modified and saved, built from this object's data
+        without making any HTTP requests.
+        """
+        return self.object_class(dict(self.raw), etag=self.etag)
+
+
 class ResultPaginator(object):
-    def __init__(self, object_class, response, etag):
+    def __init__(self, object_class, response, etag, compact=False):
         if response is None:
             response = {}
 
         self.object_class = object_class
+        self.compact = compact
+        self.object_cache = None
+        if not compact:
+            self.object_cache = Panoptes.client().object_cache
         self.set_page(response)
         self.etag = etag
 
@@ -874,7 +1688,26 @@ class ResultPaginator(object):
 
         i = self.object_index
         self.object_index += 1
-        return self.object_class(self.object_list[i], etag=self.etag)
+        if self.compact:
+            return CompactPanoptesObject(
+                self.object_class,
+                self.object_list[i],
+                etag=self.etag,
+            )
+
+        object_cache = self.object_cache
+        if object_cache is None:
+            return self.object_class(self.object_list[i], etag=self.etag)
+
+        raw = self.object_list[i]
+        cached_object = object_cache.get(self.object_class, raw.get('id'))
+        if cached_object is None:
+            cached_object = self.object_class(raw, etag=self.etag)
+            object_cache.add(cached_object)
+        elif not cached_object.modified_attributes:
+            # Refresh the canonical instance, unless it has unsaved changes
+            cached_object.set_raw(raw, self.etag)
+        return cached_object
     next = __next__
 
     def set_page(self, response):
@@ -944,6 +1777,7 @@ class LinkResolver(object):
                 value = value.id
             self.parent.raw['links'][name] = value
             self.parent.modified_attributes.add('links')
+            self.parent.modified_paths.add(('links', name))
         else:
             super(LinkResolver, self).__setattr__(name, value)
 
@@ -983,6 +1817,12 @@ class LinkCollection(object):
     """
     def __init__(self, cls, slug, parent, linked_objects):
         self._linked_object_ids = list(linked_objects)
+        # Kept alongside the list for fast membership tests. Removals only
+        # update the set; the list is compacted the next time it's read.
+        self._linked_object_id_set = set(self._linked_object_ids)
+        self._removed_ids = False
+        # Batches may be sent concurrently (see utils.batchable)
+        self._lock = threading.Lock()
         self._cls = cls
         self._slug = slug
         self._parent = parent
@@ -994,19 +1834,19 @@ class LinkCollection(object):
         else:
             obj_id = str(obj)
 
-        return obj_id in self._linked_object_ids
+        return obj_id in self._linked_object_id_set
 
     def __getitem__(self, i):
-        return self._cls(self._linked_object_ids[i])
+        return self._cls(self._ordered_ids()[i])
 
     def __iter__(self):
-        for obj_id in self._linked_object_ids:
+        for obj_id in self._ordered_ids():
             yield self._cls(obj_id)
 
     def __repr__(self):
         return "[{}]".format(", ".join([
             "<{} {}>".format(self._cls.__name__, obj)
-            for obj in self._linked_object_ids
+            for obj in self._ordered_ids()
         ]))
 
     @batchable
@@ -1024,6 +1864,8 @@ class LinkCollection(object):
             organization.links.projects.add(Project(1234))
             workflow.links.subject_sets.add([1,2,3,4])
             workflow.links.subject_sets.add([Project(12), Project(34)])
+
+        Objects are linked in batches; see :py:func:`.batchable`.
         """
 
         if self.readonly:
@@ -1036,7 +1878,10 @@ class LinkCollection(object):
                 "Links can not be modified before the object has been saved."
             )
 
-        _objs = [obj for obj in self._build_obj_list(objs) if obj not in self]
+        _objs = [
+            obj for obj in self._unique_ids(objs)
+            if obj not in self._linked_object_id_set
+        ]
         if not _objs:
             return
 
@@ -1045,9 +1890,11 @@ class LinkCollection(object):
             json={self._slug: _objs},
             retry=True,
         )
-        self._linked_object_ids.extend(_objs)
+        with self._lock:
+            self._ordered_ids().extend(_objs)
+            self._linked_object_id_set.update(_objs)
 
-    @batchable
+    @batchable(max_length=MAX_ID_LIST_LENGTH)
     def remove(self, objs):
         """
         Removes the given `objs` from this `LinkCollection`.
@@ -1056,6 +1903,9 @@ class LinkCollection(object):
           list of object IDs, a single :py:class:`.PanoptesObject` instance, or
           a single object ID.
 
+        Objects are unlinked in batches which fit in the request URL; see
+        :py:func:`.batchable`.
+
         Examples::
 
             organization.links.projects.remove(1234)
@@ -1074,7 +1924,10 @@ class LinkCollection(object):
                 "Links can not be modified before the object has been saved."
             )
 
-        _objs = [obj for obj in self._build_obj_list(objs) if obj in self]
+        _objs = [
+            obj for obj in self._unique_ids(objs)
+            if obj in self._linked_object_id_set
+        ]
         if not _objs:
             return
 
@@ -1083,9 +1936,22 @@ class LinkCollection(object):
             '{}/links/{}/{}'.format(self._parent.id, self._slug, _obj_ids),
             retry=True,
         )
-        self._linked_object_ids = [
-            obj for obj in self._linked_object_ids if obj not in _objs
-        ]
+        with self._lock:
+            self._linked_object_id_set.difference_update(_objs)
+            self._removed_ids = True
+
+    def _ordered_ids(self):
+        # Callers which modify the list must hold self._lock
+        if self._removed_ids:
+            self._linked_object_ids = [
+                obj for obj in self._linked_object_ids
+                if obj in self._linked_object_id_set
+            ]
+            self._removed_ids = False
+        return self._linked_object_ids
+
+    def _unique_ids(self, objs):
+        return list(OrderedDict.fromkeys(self._build_obj_list(objs)))
 
     def _build_obj_list(self, objs):
         _objs = []
@@ -1115,6 +1981,15 @@ class PanoptesAPIException(Exception):
     pass
 
 
+class ObjectConflictException(PanoptesAPIException):
+    """
+    Raised if the API rejects a change because the object has been modified
+    since it was loaded, i.e. its ETag no longer matches.
+    """
+
+    pass
+
+
 class ReadOnlyAttributeException(Exception):
     """
     Raised if an attempt is made to modify an attribute of a
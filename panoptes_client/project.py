@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from panoptes_client.panoptes import (
     LinkCollection,
     LinkResolver,
@@ -43,24 +41,6 @@ class Project(PanoptesObject, Exportable):
         super(Project, self).__init__(raw, etag)
         if not self.configuration:
             self.configuration = {}
-            self._original_configuration = {}
-
-    def set_raw(self, raw, etag=None, loaded=True):
-        super(Project, self).set_raw(raw, etag, loaded)
-        if loaded and self.configuration:
-            self._original_configuration = deepcopy(self.configuration)
-        elif loaded:
-            self._original_configuration = None
-
-    def save(self):
-        """
-        Adds project configuration to the list of savable attributes
-        if it has changed.
-        """
-        if not self.configuration == self._original_configuration:
-            self.modified_attributes.add('configuration')
-
-        super(Project, self).save()
 
     @classmethod
     def find(cls, id='', slug=None):
@@ -76,6 +56,10 @@ class Project(PanoptesObject, Exportable):
 
         if not id and not slug:
             return None
+        if id and not slug:
+            cached_object = cls._cached(id)
+            if cached_object is not None:
+                return cached_object
         try:
             return cls.where(id=id, slug=slug).next()
         except StopIteration:
@@ -8,13 +8,26 @@ except NameError:
 
 from builtins import range, str
 
+import base64
+import collections
+import functools
+import hashlib
+import io
+import json
 import logging
+import os
 import requests
+import sys
 import threading
 import time
 
-from copy import deepcopy
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures import as_completed as futures_as_completed
+from urllib.parse import urlencode, urlsplit, urlunsplit
 import mimetypes
 
 try:
@@ -32,18 +45,45 @@ except ImportError:
         pass
     MEDIA_TYPE_DETECTION = 'mimetypes'
 
+from panoptes_client.media_cache import DownloadResult, MediaCache
 from panoptes_client.panoptes import (
     LinkResolver,
+    ObjectConflictException,
     ObjectNotSavedException,
     Panoptes,
     PanoptesAPIException,
     PanoptesObject,
 )
+from panoptes_client.utils import read_json_lines, split_ids
 from redo import retry
 
 UPLOAD_RETRY_LIMIT = 5
 RETRY_BACKOFF_INTERVAL = 5
 ASYNC_SAVE_THREADS = 5
+DOWNLOAD_THREADS = 10
+
+# Number of bytes read from the start of a file to detect its MIME type
+MEDIA_TYPE_DETECTION_BYTES = 2048
+
+# Leading bytes of common media types, which are recognised without calling
+# libmagic (and without it, for files which aren't on disk)
+MEDIA_TYPE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+# Files at least this big are uploaded in blocks of BLOCK_UPLOAD_SIZE bytes,
+# BLOCK_UPLOAD_THREADS at a time
+BLOCK_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+BLOCK_UPLOAD_SIZE = 8 * 1024 * 1024
+BLOCK_UPLOAD_THREADS = 4
+
+# Responses from the upload host meaning a signed upload URL has expired, and
+# the number of times new URLs are requested for each subject
+EXPIRED_UPLOAD_URL_STATUS_CODES = (401, 403)
+UPLOAD_URL_REFRESH_LIMIT = 2
 
 ALLOWED_MIME_TYPES = [
     "image/jpeg",
@@ -58,6 +98,582 @@ ALLOWED_MIME_TYPES = [
     "application/json",
 ]
 
+
+class MediaFile(object):
+    """
+    A local media file waiting to be uploaded. Files given by path are
+    referred to by path and only opened to detect their type and to upload
+    them, so queued subjects don't hold their media in memory. Open file
+    objects are read into memory, since the file may not outlive them (as
+    with :py:class:`tempfile.NamedTemporaryFile`).
+    """
+
+    def __init__(self, path=None, data=None):
+        self.path = path
+        self.data = data
+        # Blocks already uploaded, so that a retried block upload can
+        # resume. See Subject._upload_blocks.
+        self.uploaded_blocks = {}
+        # Set by Subject.add_location when a MediaIndex is used
+        self.content_hash = None
+        self.media_index = None
+
+    @classmethod
+    def from_location(cls, location):
+        """
+        Returns a :py:class:`MediaFile` for a path or an open file object.
+        File objects are read and then closed.
+        """
+        if isinstance(location, _OLD_STR_TYPES):
+            # Raises now if the file is missing or unreadable, rather than
+            # when it's uploaded after the subject has been created
+            with open(location, 'rb'):
+                pass
+            return cls(path=location)
+
+        try:
+            return cls(data=location.read())
+        finally:
+            location.close()
+
+    def open(self):
+        """
+        Returns a new file object for reading the media from the start.
+        """
+        if self.path is not None:
+            return open(self.path, 'rb')
+        return io.BytesIO(self.data)
+
+    def head(self, size=MEDIA_TYPE_DETECTION_BYTES):
+        """
+        Returns up to **size** bytes from the start of the media.
+        """
+        if self.data is not None:
+            return self.data[:size]
+        with self.open() as f:
+            return f.read(size)
+
+    def read(self, offset=0, size=-1):
+        """
+        Returns **size** bytes of the media starting from **offset**, or the
+        whole contents by default.
+        """
+        if self.data is not None:
+            if size < 0:
+                return self.data[offset:]
+            return self.data[offset:offset + size]
+        with self.open() as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def sha256(self):
+        """
+        Returns the SHA-256 hex digest of the media, reading files in chunks
+        rather than all at once.
+        """
+        digest = hashlib.sha256()
+        with self.open() as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @property
+    def size(self):
+        if self.data is not None:
+            return len(self.data)
+        return os.path.getsize(self.path)
+
+
+class MediaIndex(object):
+    """
+    A local, persistent record of media which has already been uploaded,
+    keyed by the SHA-256 hash of its content. Pass one to
+    :py:meth:`.Subject.add_location` to have identical files refer to the
+    existing upload instead of being uploaded again.
+
+    The index is stored in the file at **path** as JSON lines, and is added
+    to after each successful upload. :py:attr:`hits` counts the files which
+    didn't need uploading.
+
+    Examples::
+
+        index = MediaIndex('uploads.index')
+        for filename in local_files:
+            subject = Subject()
+            subject.links.project = 1234
+            subject.add_location(filename, media_index=index)
+            subject.save()
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        for entry in read_json_lines(path):
+            self._entries[entry['sha256']] = entry
+
+        self._file = open(path, 'a')
+
+    def get(self, content_hash):
+        """
+        Returns the entry for **content_hash**, a :py:class:`dict` with the
+        ``subject`` ID, ``media_type`` and ``url``, or ``None``.
+        """
+        with self._lock:
+            return self._entries.get(content_hash)
+
+    def add(self, content_hash, subject_id, media_type, url):
+        # Signed upload URLs are stored without their signature
+        url = urlunsplit(urlsplit(url)._replace(query=''))
+        entry = {
+            'sha256': content_hash,
+            'subject': subject_id,
+            'media_type': media_type,
+            'url': url,
+        }
+        with self._lock:
+            self._entries[content_hash] = entry
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self._file.close()
+
+
+class UploadProgress(object):
+    """
+    Counts the progress of subject saves and media uploads. Pass one to
+    :py:meth:`.Subject.async_saves` or :py:meth:`.Subject.save_attached_image`.
+    It's updated from the saving and uploading threads.
+
+    - **callback** optional function which is called with this object after
+      every update, from whichever thread made the update. See
+      :py:class:`TerminalProgressReporter`.
+
+    The counts are :py:attr:`subjects_saved`, :py:attr:`subjects_failed`,
+    :py:attr:`files_queued`, :py:attr:`files_done`, :py:attr:`files_failed`,
+    :py:attr:`bytes_queued` and :py:attr:`bytes_sent`. Bytes are counted as
+    they're sent, so a retried upload counts its bytes again.
+    """
+
+    COUNTS = (
+        'subjects_saved',
+        'subjects_failed',
+        'files_queued',
+        'files_done',
+        'files_failed',
+        'bytes_queued',
+        'bytes_sent',
+    )
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        for name in self.COUNTS:
+            setattr(self, name, 0)
+
+    def update(self, **counts):
+        """
+        Adds to the named counts, then calls the callback.
+        """
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+        if self.callback:
+            self.callback(self)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self):
+        """
+        Bytes sent per second.
+        """
+        elapsed = self.elapsed
+        if not elapsed:
+            return 0
+        return self.bytes_sent / elapsed
+
+    @property
+    def eta(self):
+        """
+        Estimated seconds until the queued bytes are sent, or ``None`` if
+        nothing has been sent yet.
+        """
+        rate = self.rate
+        if not rate:
+            return None
+        return max(self.bytes_queued - self.bytes_sent, 0) / rate
+
+    def __repr__(self):
+        return (
+            '<UploadProgress {} subjects saved, {} failed; '
+            '{}/{} files uploaded, {} failed; {:.1f} MB at {:.1f} MB/s>'
+        ).format(
+            self.subjects_saved,
+            self.subjects_failed,
+            self.files_done,
+            self.files_queued,
+            self.files_failed,
+            self.bytes_sent / 1e6,
+            self.rate / 1e6,
+        )
+
+
+class TerminalProgressReporter(object):
+    """
+    An :py:class:`UploadProgress` callback which writes a one line summary
+    to **stream** (by default, stderr), at most once every **interval**
+    seconds.
+
+    Examples::
+
+        progress = UploadProgress(callback=TerminalProgressReporter())
+        with Subject.async_saves(progress=progress):
+            ...
+    """
+
+    def __init__(self, stream=None, interval=0.5):
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self._last = None
+        self._lock = threading.Lock()
+
+    def __call__(self, progress):
+        now = time.monotonic()
+        with self._lock:
+            if self._last is not None and now - self._last < self.interval:
+                return
+            self._last = now
+            eta = progress.eta
+            self.stream.write(
+                '\r{}/{} files, {} failed, {:.1f} MB, {:.1f} MB/s, '
+                'ETA {}'.format(
+                    progress.files_done,
+                    progress.files_queued,
+                    progress.files_failed,
+                    progress.bytes_sent / 1e6,
+                    progress.rate / 1e6,
+                    '{:.0f}s'.format(eta) if eta is not None else '?',
+                )
+            )
+            self.stream.flush()
+
+
+class _ProgressReader(object):
+    # Wraps a file being uploaded, to count bytes as requests reads them
+    def __init__(self, f, size, progress):
+        self._file = f
+        self._size = size
+        self._progress = progress
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        if data:
+            self._progress.update(bytes_sent=len(data))
+        return data
+
+    def __len__(self):
+        return self._size
+
+
+def _run_preprocess(preprocess, path, data):
+    # Runs in a preprocessing process
+    return preprocess(path if path is not None else data)
+
+
+class _PendingMedia(object):
+    # Stands in for a MediaFile in Subject._media_files while it's being
+    # preprocessed. See Subject._resolve_pending_media.
+    def __init__(self, future, media_file, manual_mimetype, media_index):
+        self.future = future
+        self.media_file = media_file
+        self.manual_mimetype = manual_mimetype
+        self.media_index = media_index
+
+    def result(self):
+        result = self.future.result()
+        if result is None:
+            return self.media_file
+        if isinstance(result, MediaFile):
+            return result
+        if isinstance(result, _OLD_STR_TYPES):
+            return MediaFile(path=result)
+        return MediaFile(data=bytes(result))
+
+
+class _SaveConflict(Exception):
+    # Wraps an ObjectConflictException so that retry doesn't catch it
+    def __init__(self, conflict):
+        super(_SaveConflict, self).__init__(conflict)
+        self.conflict = conflict
+
+
+class SaveFailure(object):
+    """
+    A subject save or attached image upload which failed inside
+    :py:meth:`.Subject.async_saves`. Listed in
+    :py:attr:`AsyncSaveExecutor.failures`.
+
+    - **subject** is the :py:class:`.Subject`.
+    - **files** is a list of the local files which couldn't be uploaded
+      (their paths, where known). It's empty if the subject itself couldn't
+      be saved.
+    - **exception** is the exception which was raised.
+    """
+
+    def __init__(self, subject, files, exception):
+        self.subject = subject
+        self.files = files
+        self.exception = exception
+
+    def __repr__(self):
+        return '<SaveFailure subject {}: {!r}>'.format(
+            self.subject.id,
+            self.exception,
+        )
+
+
+class AsyncSaveExecutor(object):
+    """
+    Runs subject saves and media uploads in the background. Returned by
+    :py:meth:`.Subject.async_saves`.
+
+    Saves run on up to **max_workers** threads and uploads on up to
+    **max_uploads** separate threads (by default, the same number), so that
+    creating subjects and uploading their media don't hold each other up.
+
+    At most **max_queued** saves (by default, twice **max_workers**) are
+    queued or running at once. Beyond that, :py:meth:`submit` blocks until
+    one finishes, so a loop saving many subjects can't get ahead of the
+    uploads. :py:attr:`pending` is the number currently queued or running,
+    and :py:attr:`high_water_mark` is the most there have been.
+
+    If **progress** is an :py:class:`UploadProgress`, it's updated as
+    subjects are saved and files are uploaded.
+
+    The futures for saves made by :py:meth:`.Subject.save` and
+    :py:meth:`.Subject.save_attached_image` are collected until they finish,
+    so the results can be handled together with :py:meth:`wait_all` or
+    :py:meth:`as_completed`, and anything which went wrong is listed in
+    :py:attr:`failures` and :py:attr:`cancelled`. Successful saves are only
+    counted in :py:attr:`succeeded_count`, so that memory use doesn't grow
+    with the number of subjects, unless **keep_results** is ``True``, in
+    which case their subjects are also listed in :py:attr:`succeeded`. If
+    **cancel_on_error** is ``True``, the first failure cancels the saves
+    which haven't started yet, and any saves made after that are cancelled
+    straight away.
+
+    If **preprocess** is given, local files added with
+    :py:meth:`.Subject.add_location` are passed to it in a pool of
+    **preprocess_workers** processes (by default, one per CPU), so that
+    transforming media doesn't hold up the threads which are saving and
+    uploading. See :py:meth:`.Subject.async_saves`.
+    """
+
+    def __init__(self, max_workers=ASYNC_SAVE_THREADS, max_uploads=None,
+                 max_queued=None, progress=None, cancel_on_error=False,
+                 preprocess=None, preprocess_workers=None,
+                 keep_results=False):
+        self.progress = progress
+        self.preprocess = preprocess
+        self._process_executor = None
+        if preprocess is not None:
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=preprocess_workers,
+            )
+        self.cancel_on_error = cancel_on_error
+        self.keep_results = keep_results
+        # Maps the futures of unfinished saves to their subjects
+        self._pending_saves = {}
+        self.succeeded = []
+        self.succeeded_count = 0
+        self.failures = []
+        self.cancelled = []
+        self.error = None
+        self._shutdown = False
+        self.max_workers = max_workers
+        self.max_uploads = max_uploads or max_workers
+        self.max_queued = max_queued or max_workers * 2
+        # Connections needed to each upload host. Attached images are
+        # uploaded by the save threads, and large files in several blocks.
+        self.upload_pool_size = (
+            max(self.max_workers, self.max_uploads) * BLOCK_UPLOAD_THREADS
+        )
+        self.pending = 0
+        self.high_water_mark = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=self.max_uploads,
+        )
+        self._slots = threading.BoundedSemaphore(self.max_queued)
+        self._lock = threading.Lock()
+        self._saves_done = threading.Condition(self._lock)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Like :py:meth:`concurrent.futures.Executor.submit`, but blocks while
+        **max_queued** saves are already queued or running.
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.pending += 1
+            self.high_water_mark = max(self.high_water_mark, self.pending)
+        future.add_done_callback(self._release)
+        return future
+
+    def upload(self, fn, *args, **kwargs):
+        """
+        Runs an upload on the upload threads and returns its future.
+        """
+        return self._upload_executor.submit(fn, *args, **kwargs)
+
+    def preprocess_media(self, media_file):
+        """
+        Runs **preprocess** on a :py:class:`MediaFile` in the preprocessing
+        processes and returns the future for its result.
+        """
+        return self._process_executor.submit(
+            _run_preprocess,
+            self.preprocess,
+            media_file.path,
+            media_file.data,
+        )
+
+    def wait_all(self, timeout=None):
+        """
+        Waits for all the unfinished saves to finish, then returns
+        :py:attr:`failures`. Raises :py:class:`TimeoutError` if they haven't
+        finished after **timeout** seconds.
+
+        Examples::
+
+            with Subject.async_saves() as pool:
+                for filename in local_files:
+                    s = Subject()
+                    s.links.project = 1234
+                    s.add_location(filename)
+                    s.save()
+
+                for failure in pool.wait_all():
+                    print(failure.subject, failure.files, failure.exception)
+        """
+        # Waits for the saves to be recorded as finished, not just for their
+        # futures, so that their results have been counted
+        with self._saves_done:
+            futures = list(self._pending_saves)
+            finished = self._saves_done.wait_for(
+                lambda: not any(f in self._pending_saves for f in futures),
+                timeout=timeout,
+            )
+            if not finished:
+                raise TimeoutError('{} saves did not finish in time'.format(
+                    sum(f in self._pending_saves for f in futures)
+                ))
+        return self.failures
+
+    def as_completed(self, timeout=None):
+        """
+        A generator which yields ``(subject, future)`` for each of the saves
+        which are unfinished when this is called, as it finishes. Saves which
+        have already finished are reported in :py:attr:`succeeded_count`,
+        :py:attr:`failures` and :py:attr:`cancelled`.
+
+        Examples::
+
+            for subject, future in pool.as_completed():
+                if future.cancelled() or future.exception():
+                    ...
+        """
+        with self._lock:
+            subjects = dict(self._pending_saves)
+        return (
+            (subjects[future], future)
+            for future in futures_as_completed(subjects, timeout=timeout)
+        )
+
+    def _submit_save(self, subject, files, fn, *args, **kwargs):
+        # Submits a save for subject, which is collected until it finishes so
+        # its result can be reported. files are the local files it uploads.
+        if self._shutdown:
+            raise RuntimeError('cannot schedule new saves after shutdown')
+        if self.cancel_on_error and self.error is not None:
+            future = Future()
+            future.cancel()
+            future.set_running_or_notify_cancel()
+        else:
+            future = self.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._pending_saves[future] = subject
+        future.add_done_callback(
+            lambda future: self._save_done(subject, files, future)
+        )
+        return future
+
+    def _save_done(self, subject, files, future):
+        exception = None
+        if not future.cancelled():
+            exception = future.exception()
+        if exception is not None and files is None:
+            files = getattr(subject, '_failed_files', [])
+
+        first_error = False
+        with self._saves_done:
+            del self._pending_saves[future]
+            if future.cancelled():
+                self.cancelled.append(subject)
+            elif exception is None:
+                self.succeeded_count += 1
+                if self.keep_results:
+                    self.succeeded.append(subject)
+            else:
+                self.failures.append(SaveFailure(subject, files, exception))
+                first_error = self.error is None
+                if first_error:
+                    self.error = exception
+            futures = list(self._pending_saves)
+            self._saves_done.notify_all()
+        if first_error and self.cancel_on_error:
+            for other in futures:
+                other.cancel()
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+    def shutdown(self, wait=True):
+        self._shutdown = True
+        self._executor.shutdown(wait=wait)
+        self._upload_executor.shutdown(wait=wait)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=True)
+        return False
+
+
 class Subject(PanoptesObject):
     _api_slug = 'subjects'
     _link_slug = 'subjects'
@@ -73,7 +689,10 @@ class Subject(PanoptesObject):
     _local = threading.local()
 
     @classmethod
-    def async_saves(cls):
+    def async_saves(cls, max_workers=ASYNC_SAVE_THREADS, max_uploads=None,
+                    max_queued=None, progress=None, cancel_on_error=False,
+                    preprocess=None, preprocess_workers=None,
+                    keep_results=False):
         """
         Returns a context manager to allow asynchronously creating subjects
         or creating and uploading subject attached images/media.
@@ -82,6 +701,35 @@ class Subject(PanoptesObject):
         create multiple subjects at once and upload any local files
         simultaneously.
 
+        - **max_workers** is the number of subjects saved at once.
+        - **max_uploads** is the number of files uploaded at once. Defaults
+          to **max_workers**.
+        - **max_queued** is the number of saves which can be waiting or in
+          progress before :py:meth:`save` blocks. Defaults to twice
+          **max_workers**.
+        - **progress** optional :py:class:`UploadProgress` to report saves
+          and uploads to.
+        - **cancel_on_error** if ``True``, the first failed save cancels the
+          saves which haven't started yet.
+        - **preprocess** optional function to transform each local file
+          added with :py:meth:`add_location` before it's uploaded, such as
+          to resize or recompress images. It's called in a separate process
+          (so it must be a module-level function) with the file's path, or
+          its contents as :py:class:`bytes` if it isn't a file on disk. It
+          should return the new contents as :py:class:`bytes`, the path of a
+          new file, or ``None`` to upload the original. The MIME type is
+          detected from the result, when the subject is saved.
+        - **preprocess_workers** is the number of processes to run
+          **preprocess** in. Defaults to the number of CPUs.
+        - **keep_results** if ``True``, the subjects which were saved
+          successfully are listed in :py:attr:`AsyncSaveExecutor.succeeded`.
+          Otherwise they're only counted.
+
+        The returned object is an :py:class:`AsyncSaveExecutor`, which
+        collects the futures returned by :py:meth:`save` and
+        :py:meth:`save_attached_image`. See
+        :py:meth:`AsyncSaveExecutor.wait_all`.
+
         The recommended way to use this is with the `with` statement::
 
             with Subject.async_saves():
@@ -111,20 +759,39 @@ class Subject(PanoptesObject):
             finally:
                 pool.shutdown()
         """
-        cls._local.save_exec = ThreadPoolExecutor(
-            max_workers=ASYNC_SAVE_THREADS
+        cls._local.save_exec = AsyncSaveExecutor(
+            max_workers=max_workers,
+            max_uploads=max_uploads,
+            max_queued=max_queued,
+            progress=progress,
+            cancel_on_error=cancel_on_error,
+            preprocess=preprocess,
+            preprocess_workers=preprocess_workers,
+            keep_results=keep_results,
         )
         return cls._local.save_exec
 
     def __init__(self, raw={}, etag=None):
         super(Subject, self).__init__(raw, etag)
+        # Subjects created from just an ID are set up when they're first
+        # loaded, so that they can be fetched in batches (as download_many
+        # does) rather than one request each
+        if self._loaded:
+            self._set_defaults()
+
+    def _set_defaults(self):
         if not self.locations:
             self.locations = []
         if not self.metadata:
             self.metadata = {}
-            self._original_metadata = {}
         self._media_files = [None] * len(self.locations)
 
+    def reload(self):
+        was_loaded = self._loaded
+        super(Subject, self).reload()
+        if not was_loaded:
+            self._set_defaults()
+
     def save(self, client=None):
         """
         Like :py:meth:`.PanoptesObject.save`, but also uploads any local files
@@ -132,77 +799,274 @@ class Subject(PanoptesObject):
         :py:meth:`add_location`. Automatically retries uploads on error.
 
         If multiple local files are to be uploaded, several files will be
-        uploaded simultaneously to save time.
+        uploaded simultaneously to save time. If an upload still fails after
+        retrying, its exception is raised (or, inside
+        :py:meth:`async_saves`, raised by :py:attr:`async_save_result`).
+
+        Inside :py:meth:`async_saves`, returns the save's
+        :py:class:`concurrent.futures.Future`.
         """
         if not client:
             client = Panoptes.client()
 
-        async_save = hasattr(self._local, 'save_exec')
+        save_exec = getattr(self._local, 'save_exec', None)
 
         with client:
-            if async_save:
+            if save_exec is not None:
+                client.set_upload_pool_size(save_exec.upload_pool_size)
                 try:
-                    # The recursive call will exec in a new thread, so
-                    # self._local.save_exec will be undefined above
-                    self._async_future = self._local.save_exec.submit(
-                        self.save,
-                        client=client,
+                    self._async_future = save_exec._submit_save(
+                        self,
+                        None,
+                        self._save,
+                        client,
+                        save_exec.upload,
+                        save_exec.progress,
                     )
-                    return
+                    return self._async_future
                 except RuntimeError:
                     del self._local.save_exec
-                    async_save = False
-
-            if not self.metadata == self._original_metadata:
-                self.modified_attributes.add('metadata')
 
-            response = retry(
-                super(Subject, self).save,
-                attempts=UPLOAD_RETRY_LIMIT,
-                sleeptime=RETRY_BACKOFF_INTERVAL,
-                retry_exceptions=(PanoptesAPIException,),
-                log_args=False,
+            client.set_upload_pool_size(
+                ASYNC_SAVE_THREADS * BLOCK_UPLOAD_THREADS
+            )
+            upload_exec = ThreadPoolExecutor(max_workers=ASYNC_SAVE_THREADS)
+            try:
+                self._save(client, upload_exec.submit)
+            finally:
+                upload_exec.shutdown()
+
+    def _save(self, client, submit_upload, progress=None, on_saved=None):
+        # on_saved is called once the subject itself is saved, before its
+        # media is uploaded
+        if progress is None:
+            return self._save_and_upload(
+                client,
+                submit_upload,
+                progress,
+                on_saved,
             )
+        try:
+            self._save_and_upload(client, submit_upload, progress, on_saved)
+        except Exception:
+            progress.update(subjects_failed=1)
+            raise
+        progress.update(subjects_saved=1)
+
+    def _save_and_upload(self, client, submit_upload, progress,
+                         on_saved=None):
+        # Runs in a worker thread when called from async_saves, so the client
+        # context is entered again here
+        with client:
+            self._resolve_pending_media()
+            try:
+                response = retry(
+                    self._save_resource,
+                    attempts=UPLOAD_RETRY_LIMIT,
+                    sleeptime=RETRY_BACKOFF_INTERVAL,
+                    retry_exceptions=(PanoptesAPIException,),
+                    log_args=False,
+                )
+            except _SaveConflict as e:
+                raise e.conflict
 
             if not response:
                 return
-
-            try:
-                if async_save:
-                    upload_exec = self._local.save_exec
-                else:
-                    upload_exec = ThreadPoolExecutor(
-                        max_workers=ASYNC_SAVE_THREADS,
-                    )
-
-                for location, media_data in zip(
-                    response['subjects'][0]['locations'],
-                    self._media_files
-                ):
+            if on_saved is not None:
+                on_saved(self)
+
+            # Uploaded once, then again if the upload URLs expired and were
+            # replaced while uploading
+            media_files = self._media_files
+            self._media_files = [None] * len(self.locations)
+            self._failed_files = []
+            self._upload_urls = response['subjects'][0]['locations']
+            self._upload_urls_generation = 0
+            self._upload_urls_lock = threading.Lock()
+            for _ in range(UPLOAD_URL_REFRESH_LIMIT + 1):
+                upload_urls = self._upload_urls
+                generation = self._upload_urls_generation
+                uploads = []
+                for location, media_data in zip(upload_urls, media_files):
                     if not media_data:
                         continue
 
                     for media_type, url in location.items():
-                        upload_exec.submit(
+                        if progress is not None:
+                            progress.update(
+                                files_queued=1,
+                                bytes_queued=media_data.size,
+                            )
+                        uploads.append((media_data, submit_upload(
                             retry,
-                            self._upload_media,
-                            args=(url, media_data, media_type),
+                            self._upload_location,
+                            args=(
+                                generation,
+                                url,
+                                media_data,
+                                media_type,
+                                media_files,
+                                client,
+                                progress,
+                            ),
                             attempts=UPLOAD_RETRY_LIMIT,
                             sleeptime=RETRY_BACKOFF_INTERVAL,
                             retry_exceptions=(
                                 requests.exceptions.RequestException,
                             ),
                             log_args=False,
+                        )))
+
+                # Waiting here keeps the save's queue slot until its media
+                # is uploaded, and raises any upload failure
+                error = None
+                for media_data, upload in uploads:
+                    try:
+                        upload.result()
+                    except Exception as e:
+                        error = error or e
+                        self._failed_files.append(
+                            media_data.path or media_data
                         )
+                        if progress is not None:
+                            progress.update(files_failed=1)
+                    else:
+                        if progress is not None:
+                            progress.update(files_done=1)
+                if error:
+                    raise error
+
+                if self._upload_urls_generation == generation:
+                    # Locations changed since the subject was saved
+                    if generation and client.reload_after_save:
+                        self.reload()
+                    return
 
-                self._media_files = [None] * len(self.locations)
+            raise PanoptesAPIException(
+                'Upload URLs for subject {} kept expiring'.format(self.id)
+            )
 
-            finally:
-                if not async_save:
-                    upload_exec.shutdown()
+    def _save_resource(self):
+        # Saving again with the same ETag would just conflict again, so
+        # conflicts are passed out of the retry loop as _SaveConflict, to be
+        # handled by the caller (such as Panoptes.bulk)
+        try:
+            return super(Subject, self).save()
+        except ObjectConflictException as e:
+            raise _SaveConflict(e)
+
+    def _resolve_pending_media(self):
+        # Waits for any files being preprocessed, then fills in their
+        # locations from the results
+        for i, media_file in enumerate(self._media_files):
+            if not isinstance(media_file, _PendingMedia):
+                continue
+
+            result = media_file.result()
+            media_type = self._detect_media_type(
+                result,
+                media_file.manual_mimetype,
+            )
+            self._validate_media_type(media_type)
+            url = self._find_indexed_media(
+                result,
+                media_type,
+                media_file.media_index,
+            )
+            if url:
+                self.locations[i] = {media_type: url}
+                self._media_files[i] = None
+            else:
+                self.locations[i] = media_type
+                self._media_files[i] = result
 
-    def _upload_media(self, url, media_data, media_type):
-        upload_response = requests.put(
+    def _upload_location(self, generation, url, media_data, media_type,
+                         media_files, client, progress=None):
+        try:
+            return self._upload_media(
+                url,
+                media_data,
+                media_type,
+                client,
+                progress,
+            )
+        except requests.exceptions.HTTPError as e:
+            status_code = getattr(e.response, 'status_code', None)
+            if status_code not in EXPIRED_UPLOAD_URL_STATUS_CODES:
+                raise
+
+        # The signed URL has probably expired. Get new ones, unless another
+        # upload for this subject already has, and let _save upload again.
+        with self._upload_urls_lock:
+            if self._upload_urls_generation != generation:
+                return
+            logging.getLogger('panoptes_client').info(
+                'Upload to %s was refused (HTTP %s). Getting new upload URLs '
+                'for subject %s.',
+                url.split('?')[0],
+                status_code,
+                self.id,
+            )
+            locations = [
+                next(iter(location)) if media_file else location
+                for location, media_file in zip(
+                    self._upload_urls,
+                    media_files,
+                )
+            ]
+            with client:
+                response, etag = self.http_put(
+                    str(self.id),
+                    json={'subjects': {'locations': locations}},
+                    etag=self.etag,
+                )
+            self.etag = etag
+            self._upload_urls = response['subjects'][0]['locations']
+            self._upload_urls_generation += 1
+
+    def _upload_media(self, url, media_data, media_type, client=None,
+                      progress=None):
+        if not client:
+            client = Panoptes.client()
+
+        response = self._send_media(
+            url,
+            media_data,
+            media_type,
+            client,
+            progress,
+        )
+        if (
+            isinstance(media_data, MediaFile)
+            and media_data.media_index is not None
+        ):
+            media_data.media_index.add(
+                media_data.content_hash,
+                self.id,
+                media_type,
+                url,
+            )
+        return response
+
+    def _send_media(self, url, media_data, media_type, client,
+                    progress=None):
+        # Files are reopened on each attempt, so retries start from the
+        # beginning, and are streamed rather than read into memory
+        if isinstance(media_data, MediaFile):
+            if media_data.size >= BLOCK_UPLOAD_THRESHOLD:
+                return self._upload_blocks(
+                    url,
+                    media_data,
+                    media_type,
+                    client,
+                    progress,
+                )
+            with media_data.open() as f:
+                if progress is not None:
+                    f = _ProgressReader(f, media_data.size, progress)
+                return self._send_media(url, f, media_type, client)
+
+        upload_response = client.upload_session(url).put(
             url,
             headers={
                 'Content-Type': media_type,
@@ -213,14 +1077,104 @@ class Subject(PanoptesObject):
         upload_response.raise_for_status()
         return upload_response
 
+    def _upload_blocks(self, url, media_file, media_type, client,
+                       progress=None):
+        # Uploads the file as separate blocks (Put Block) then commits them
+        # (Put Block List). Each block is retried on its own, and blocks
+        # which were uploaded by an earlier attempt are skipped, so a failure
+        # doesn't mean starting again from the beginning.
+        session = client.upload_session(url)
+        separator = '&' if '?' in url else '?'
+        uploaded = media_file.uploaded_blocks.setdefault(url, set())
+
+        block_ids = []
+        for offset in range(0, media_file.size, BLOCK_UPLOAD_SIZE):
+            # Block IDs must all be the same length
+            block_ids.append((
+                base64.b64encode(
+                    '{:010d}'.format(offset).encode()
+                ).decode(),
+                offset,
+            ))
+
+        def put_block(block_id, offset):
+            data = media_file.read(offset, BLOCK_UPLOAD_SIZE)
+            response = session.put(
+                url + separator + urlencode({
+                    'comp': 'block',
+                    'blockid': block_id,
+                }),
+                data=data,
+            )
+            response.raise_for_status()
+            uploaded.add(block_id)
+            if progress is not None:
+                progress.update(bytes_sent=len(data))
+
+        with ThreadPoolExecutor(max_workers=BLOCK_UPLOAD_THREADS) as executor:
+            futures = [
+                executor.submit(
+                    retry,
+                    put_block,
+                    args=(block_id, offset),
+                    attempts=UPLOAD_RETRY_LIMIT,
+                    sleeptime=RETRY_BACKOFF_INTERVAL,
+                    retry_exceptions=(requests.exceptions.RequestException,),
+                    log_args=False,
+                )
+                for block_id, offset in block_ids
+                if block_id not in uploaded
+            ]
+            for future in futures:
+                future.result()
+
+        block_list = ''.join(
+            '<Latest>{}</Latest>'.format(block_id)
+            for block_id, _ in block_ids
+        )
+        upload_response = session.put(
+            url + separator + urlencode({'comp': 'blocklist'}),
+            headers={'x-ms-blob-content-type': media_type},
+            data=(
+                '<?xml version="1.0" encoding="utf-8"?>'
+                '<BlockList>{}</BlockList>'.format(block_list)
+            ),
+        )
+        upload_response.raise_for_status()
+        del media_file.uploaded_blocks[url]
+        return upload_response
+
     def _detect_media_type(self, media_data=None, manual_mimetype=None):
         if manual_mimetype is not None:
             return manual_mimetype
 
+        path = None
+        if isinstance(media_data, MediaFile):
+            path = media_data.path
+            if MEDIA_TYPE_DETECTION == 'mimetypes' and path:
+                return self._guess_media_type(path)
+            media_data = media_data.head()
+
+        for signature, media_type in MEDIA_TYPE_SIGNATURES:
+            if media_data.startswith(signature):
+                return media_type
+
         if MEDIA_TYPE_DETECTION == 'magic':
-            return magic.from_buffer(media_data, mime=True)
+            media_type = magic.from_buffer(
+                media_data[:MEDIA_TYPE_DETECTION_BYTES],
+                mime=True,
+            )
+            if media_type == 'application/octet-stream' and path:
+                media_type = mimetypes.guess_type(path)[0] or media_type
+            return media_type
 
-        media_type = mimetypes.guess_type(media_data)[0]
+        return self._guess_media_type(path)
+
+    def _guess_media_type(self, path):
+        # Looks up the file extension
+        media_type = None
+        if path:
+            media_type = mimetypes.guess_type(path)[0]
         if not media_type:
             raise UnknownMediaException(
                 'Could not detect file type. Please try installing '
@@ -264,11 +1218,6 @@ class Subject(PanoptesObject):
             raise ObjectNotSavedException
         return self.http_get('{}/attached_images'.format(self.id))[0]
 
-    def set_raw(self, raw, etag=None, loaded=True):
-        super(Subject, self).set_raw(raw, etag, loaded)
-        if loaded and self.metadata:
-            self._original_metadata = deepcopy(self.metadata)
-
     def subject_workflow_status(self, workflow_id):
         """
         Returns SubjectWorkflowStatus of Subject in Workflow
@@ -279,7 +1228,7 @@ class Subject(PanoptesObject):
         """
         return next(SubjectWorkflowStatus.where(subject_id=self.id, workflow_id=workflow_id))
 
-    def add_location(self, location, manual_mimetype=None):
+    def add_location(self, location, manual_mimetype=None, media_index=None):
         """
         Add a media location to this subject.
 
@@ -289,6 +1238,19 @@ class Subject(PanoptesObject):
 
         - **manual_mimetype** optional, passes in a specific MIME type for media item.
 
+        - **media_index** optional :py:class:`.MediaIndex`. If a local file
+          has the same content as one which was uploaded before, the
+          existing upload's URL is used instead of uploading it again.
+
+        Local files aren't kept in memory. Only the start of the file is read
+        to detect its type, and the file is streamed from disk when the
+        subject is saved, so it must not be moved or deleted before then.
+
+        Inside :py:meth:`async_saves` with a **preprocess** function, local
+        files are preprocessed in the background and their type is detected
+        from the result when the subject is saved, so an unknown or disallowed
+        type is raised by the save rather than here.
+
         Examples::
 
             subject.add_location(my_file)
@@ -301,22 +1263,57 @@ class Subject(PanoptesObject):
             self._media_files.append(None)
             self.modified_attributes.add('locations')
             return
-        elif type(location) in (str,) + _OLD_STR_TYPES:
-            f = open(location, 'rb')
-        else:
-            f = location
 
-        try:
-            media_data = f.read()
-            media_type = self._detect_media_type(media_data, manual_mimetype)
+        media_file = MediaFile.from_location(location)
+
+        save_exec = getattr(self._local, 'save_exec', None)
+        if (
+            save_exec is not None
+            and save_exec.preprocess is not None
+            and not save_exec._shutdown
+        ):
+            # The location is filled in when the subject is saved
+            self.locations.append(None)
+            self._media_files.append(_PendingMedia(
+                save_exec.preprocess_media(media_file),
+                media_file,
+                manual_mimetype,
+                media_index,
+            ))
+            self.modified_attributes.add('locations')
+            return
 
-            self._validate_media_type(media_type)
+        media_type = self._detect_media_type(media_file, manual_mimetype)
 
-            self.locations.append(media_type)
-            self._media_files.append(media_data)
-            self.modified_attributes.add('locations')
-        finally:
-            f.close()
+        self._validate_media_type(media_type)
+
+        url = self._find_indexed_media(media_file, media_type, media_index)
+        if url:
+            self.add_location({media_type: url})
+            return
+
+        self.locations.append(media_type)
+        self._media_files.append(media_file)
+        self.modified_attributes.add('locations')
+
+    def _find_indexed_media(self, media_file, media_type, media_index):
+        # Returns the URL of an earlier upload of the same media, or sets up
+        # media_file to be added to the index once it's uploaded
+        if media_index is None:
+            return None
+
+        media_file.content_hash = media_file.sha256()
+        entry = media_index.get(media_file.content_hash)
+        if entry and entry['media_type'] == media_type:
+            logging.getLogger('panoptes_client').debug(
+                'Reusing media uploaded for subject %s: %s',
+                entry['subject'],
+                entry['url'],
+            )
+            media_index.record_hit()
+            return entry['url']
+        media_file.media_index = media_index
+        return None
 
     def _add_attached_image(
         self,
@@ -345,7 +1342,7 @@ class Subject(PanoptesObject):
 
             return json_response['media'][0]['src']
 
-    def _save_attached_image(self, attached_media, manual_mimetype=None, metadata=None, client=None):
+    def _save_attached_image(self, attached_media, manual_mimetype=None, metadata=None, client=None, progress=None):
         if not client:
             client = Panoptes.client()
 
@@ -361,32 +1358,31 @@ class Subject(PanoptesObject):
                         external_link=True,
                     )
                 return
-            elif type(attached_media) in (str,) + _OLD_STR_TYPES:
-                f = open(attached_media, 'rb')
-            else:
-                f = attached_media
 
-            media_type = None
-            try:
-                media_data = f.read()
-                media_type = self._detect_media_type(media_data, manual_mimetype)
-                self._validate_media_type(media_type)
-            finally:
-                f.close()
+            media_data = MediaFile.from_location(attached_media)
+            media_type = self._detect_media_type(media_data, manual_mimetype)
+            self._validate_media_type(media_type)
             file_url = self._add_attached_image(
                 src=None,
                 content_type=media_type,
                 metadata=metadata,
                 external_link=False,
             )
-            self._upload_media(file_url, media_data, media_type)
+            self._upload_media(
+                file_url,
+                media_data,
+                media_type,
+                client,
+                progress,
+            )
 
     def save_attached_image(
         self,
         attached_media,
         manual_mimetype=None,
         metadata=None,
-        client=None
+        client=None,
+        progress=None,
     ):
         """
         Add a attached_media to this subject.
@@ -400,6 +1396,7 @@ class Subject(PanoptesObject):
         - **manual_mimetype** optional string, passes in a specific MIME type for media item.
         - **metadata** can be a :py:class:`dict` that stores additional info on attached_media.
         - **client** optional Panoptes.client() instance. Sent as a parameter for threading purposes for parallelization so that thread uses the correct client context.
+        - **progress** optional :py:class:`UploadProgress` to report the upload to. Defaults to the one given to :py:meth:`async_saves`, if any.
 
         Examples::
 
@@ -435,6 +1432,10 @@ class Subject(PanoptesObject):
             client = Panoptes.client()
 
         async_save = hasattr(self._local, 'save_exec')
+        if async_save:
+            client.set_upload_pool_size(self._local.save_exec.upload_pool_size)
+            if progress is None:
+                progress = self._local.save_exec.progress
 
         future_result = None
         with client:
@@ -443,16 +1444,23 @@ class Subject(PanoptesObject):
             try:
                 if async_save:
                     upload_exec = self._local.save_exec
+                    submit = functools.partial(
+                        upload_exec._submit_save,
+                        self,
+                        [attached_media],
+                    )
                 else:
                     upload_exec = ThreadPoolExecutor(max_workers=ASYNC_SAVE_THREADS)
-                future_result = upload_exec.submit(
+                    submit = upload_exec.submit
+                future_result = submit(
                     retry,
                     self._save_attached_image,
                     args=(
                         attached_media,
                         manual_mimetype,
                         metadata,
-                        client
+                        client,
+                        progress,
                     ),
                     attempts=UPLOAD_RETRY_LIMIT,
                     sleeptime=RETRY_BACKOFF_INTERVAL,
@@ -461,12 +1469,239 @@ class Subject(PanoptesObject):
                     ),
                     log_args=False,
                 )
+                if progress is not None:
+                    progress.update(files_queued=1)
+                    future_result.add_done_callback(
+                        lambda future: progress.update(**{
+                            'files_failed'
+                            if future.cancelled() or future.exception()
+                            else 'files_done': 1
+                        })
+                    )
             finally:
                 if not async_save:
                     # Shuts down and waits for the task if this isn't being used in a `async_saves` block
                     upload_exec.shutdown(wait=True)
         return future_result
 
+    @classmethod
+    def save_attached_images(
+        cls,
+        attached_images,
+        max_workers=ASYNC_SAVE_THREADS,
+        max_queued=None,
+        progress=None,
+        cancel_on_error=False,
+        keep_results=True,
+        client=None,
+    ):
+        """
+        Saves attached images/media for many subjects in parallel. See
+        :py:meth:`save_attached_image`.
+
+        - **attached_images** is an iterable of ``(subject, attached_media)``
+          or ``(subject, attached_media, metadata)`` tuples. It's consumed
+          lazily, so it can be a generator.
+        - **max_workers** is the number of images saved at once.
+        - **max_queued**, **progress**, **cancel_on_error** and
+          **keep_results** are as for :py:meth:`async_saves`, except that
+          **keep_results** defaults to ``True``.
+        - **client** optional Panoptes.client() instance.
+
+        All the images share one thread pool, and local files are streamed
+        from disk through the upload host's pooled session. Waits for all the
+        images to be saved, then returns the :py:class:`AsyncSaveExecutor`,
+        whose :py:attr:`~AsyncSaveExecutor.succeeded`,
+        :py:attr:`~AsyncSaveExecutor.failures` and
+        :py:attr:`~AsyncSaveExecutor.cancelled` report the results.
+
+        Examples::
+
+            report = Subject.save_attached_images(
+                (Subject(subject_id), path, {'source': 'camera 1'})
+                for subject_id, path in talk_images
+            )
+            for failure in report.failures:
+                print(failure.subject.id, failure.files, failure.exception)
+        """
+        if not client:
+            client = Panoptes.client()
+
+        previous = getattr(cls._local, 'save_exec', None)
+        save_exec = AsyncSaveExecutor(
+            max_workers=max_workers,
+            max_queued=max_queued,
+            progress=progress,
+            cancel_on_error=cancel_on_error,
+            keep_results=keep_results,
+        )
+        cls._local.save_exec = save_exec
+        try:
+            with save_exec:
+                for attached_image in attached_images:
+                    subject, attached_media = attached_image[:2]
+                    metadata = None
+                    if len(attached_image) > 2:
+                        metadata = attached_image[2]
+                    subject.save_attached_image(
+                        attached_media,
+                        metadata=metadata,
+                        client=client,
+                    )
+                save_exec.wait_all()
+        finally:
+            if previous is None:
+                del cls._local.save_exec
+            else:
+                cls._local.save_exec = previous
+        return save_exec
+
+    def download_locations(self, cache, max_workers=DOWNLOAD_THREADS,
+                           client=None):
+        """
+        Downloads this subject's media into a :py:class:`.MediaCache`, and
+        returns a list of the cached paths, in the same order as
+        :py:attr:`locations`. Files which are already cached aren't
+        downloaded again.
+
+        - **cache** is a :py:class:`.MediaCache` or the path to its
+          directory.
+        - **max_workers** is the number of files downloaded at once.
+        - **client** optional Panoptes.client() instance.
+
+        Raises the first exception if any file couldn't be downloaded.
+
+        Examples::
+
+            for path in subject.download_locations('media'):
+                print(path)
+        """
+        result = self.download_many(
+            [self],
+            cache,
+            max_workers=max_workers,
+            client=client,
+        )
+        if result.failed:
+            raise result.failed[0][2]
+        return result.paths[self.id]
+
+    @classmethod
+    def download_many(cls, subjects, cache, max_workers=DOWNLOAD_THREADS,
+                      client=None):
+        """
+        Downloads the media of many subjects into a :py:class:`.MediaCache`
+        and returns a :py:class:`.DownloadResult`.
+
+        - **subjects** is any iterable of :py:class:`Subject` instances. It's
+          consumed lazily. Subjects which haven't been loaded yet, such as
+          those from :py:attr:`.SubjectSet.subjects`, are fetched in batches
+          rather than one at a time.
+        - **cache** is a :py:class:`.MediaCache` or the path to its
+          directory.
+        - **max_workers** is the number of files downloaded at once.
+        - **client** optional Panoptes.client() instance.
+
+        Each file is downloaded through its host's pooled session (see
+        :py:meth:`.Panoptes.upload_session`) and retried on error. Failures
+        are listed in the result rather than raised. Running it again with
+        the same cache skips the files which were downloaded, and continues
+        interrupted downloads.
+
+        Examples::
+
+            result = Subject.download_many(
+                Subject.where(subject_set_id=1234),
+                'media',
+            )
+            print(result.rate)
+        """
+        if not client:
+            client = Panoptes.client()
+
+        close_cache = False
+        if not isinstance(cache, MediaCache):
+            cache = MediaCache(cache)
+            close_cache = True
+
+        client.set_upload_pool_size(max_workers)
+        result = DownloadResult()
+
+        def download(subject_id, index, url):
+            try:
+                path, downloaded = retry(
+                    cache.download,
+                    args=(url, client.upload_session(url)),
+                    attempts=UPLOAD_RETRY_LIMIT,
+                    sleeptime=RETRY_BACKOFF_INTERVAL,
+                    retry_exceptions=(requests.exceptions.RequestException,),
+                    log_args=False,
+                )
+            except Exception as e:
+                result.add_failure(subject_id, url, e)
+                return
+            result.add(subject_id, index, path, downloaded)
+
+        in_flight = collections.deque()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for subject, loaded in cls._load_batches(subjects):
+                    if loaded is None:
+                        result.add_failure(
+                            subject.id,
+                            None,
+                            PanoptesAPIException(
+                                "Could not find Subject with id='{}'".format(
+                                    subject.id
+                                )
+                            ),
+                        )
+                        continue
+                    urls = [
+                        url for location in loaded.locations
+                        if isinstance(location, dict)
+                        for url in location.values()
+                    ]
+                    result.paths[subject.id] = [None] * len(urls)
+                    for index, url in enumerate(urls):
+                        in_flight.append(
+                            executor.submit(download, subject.id, index, url)
+                        )
+                        if len(in_flight) >= max_workers * 2:
+                            in_flight.popleft().result()
+                while in_flight:
+                    in_flight.popleft().result()
+        finally:
+            result.finished = time.monotonic()
+            if close_cache:
+                cache.close()
+        return result
+
+    @classmethod
+    def _load_batches(cls, subjects):
+        """
+        Yields ``(subject, loaded)`` for each of **subjects**, where
+        **loaded** is the same subject with its attributes fetched, or
+        ``None`` if it couldn't be found. Unloaded subjects are fetched with
+        one request per batch.
+        """
+        for batch in split_ids(subjects):
+            ids = [str(subject.id) for subject in batch if not subject._loaded]
+            loaded = {}
+            if ids:
+                loaded = {
+                    str(subject.id): subject
+                    for subject in cls.where(
+                        id=','.join(ids),
+                        page_size=len(ids),
+                    )
+                }
+            for subject in batch:
+                if subject._loaded:
+                    yield subject, subject
+                else:
+                    yield subject, loaded.get(str(subject.id))
+
 
 class UnknownMediaException(Exception):
     pass
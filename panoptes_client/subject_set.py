@@ -1,5 +1,4 @@
 from builtins import str
-from copy import deepcopy
 from panoptes_client.subject_workflow_status import SubjectWorkflowStatus
 
 from panoptes_client.panoptes import (
@@ -11,11 +10,16 @@ from panoptes_client.panoptes import (
 from panoptes_client.set_member_subject import SetMemberSubject
 from panoptes_client.subject import Subject
 from panoptes_client.exportable import Exportable
-from panoptes_client.utils import batchable
+from panoptes_client.ingest import ingest
+from panoptes_client.utils import MAX_ID_LIST_LENGTH, batchable
 
 from redo import retry
 
 
+# Page size used when listing every subject in a set
+SCAN_PAGE_SIZE = 100
+
+
 class SubjectSetLinkCollection(LinkCollection):
     def __contains__(self, obj):
         if self._cls == Subject:
@@ -32,6 +36,66 @@ class SubjectSetLinkCollection(LinkCollection):
             return linked_subject_count == 1
         return super(SubjectSetLinkCollection, self).__contains__(obj)
 
+    def contains_many(self, objs, max_workers=None):
+        """
+        Returns the set of IDs (as strings) of the given subjects which are
+        in this subject set. Much faster than testing each subject with
+        ``in``.
+
+        - **objs** is any iterable of :py:class:`.Subject` instances or
+          subject IDs.
+        - **max_workers** is passed to :py:func:`.batchable` to send
+          batches concurrently.
+
+        If there are fewer subjects in the set than there are to check, every
+        subject in the set is listed. Otherwise the subjects are looked up in
+        batches.
+
+        Examples::
+
+            present = subject_set.links.subjects.contains_many(subject_ids)
+            new_subjects = [s for s in subject_ids if str(s) not in present]
+        """
+        if self._cls != Subject:
+            return set(
+                obj for obj in self._unique_ids(objs)
+                if obj in self._linked_object_id_set
+            )
+
+        subject_ids = set(self._unique_ids(objs))
+        if not subject_ids:
+            return set()
+
+        set_size = getattr(self._parent, 'set_member_subjects_count', None)
+        if set_size is not None and set_size <= len(subject_ids):
+            return subject_ids.intersection(self._scan_subject_ids())
+
+        result = self._present_subject_ids(
+            sorted(subject_ids),
+            max_workers=max_workers,
+        )
+        return set().union(*result.results)
+
+    def _scan_subject_ids(self):
+        for sms in SetMemberSubject.where(
+            subject_set_id=self._parent.id,
+            page_size=SCAN_PAGE_SIZE,
+            compact=True,
+        ):
+            yield str(sms.raw['links']['subject'])
+
+    @batchable(max_length=MAX_ID_LIST_LENGTH)
+    def _present_subject_ids(self, subject_ids):
+        return set(
+            str(sms.raw['links']['subject'])
+            for sms in SetMemberSubject.where(
+                subject_set_id=self._parent.id,
+                subject_id=','.join(subject_ids),
+                page_size=len(subject_ids),
+                compact=True,
+            )
+        )
+
     def add(self, objs):
         from panoptes_client.workflow import Workflow
         if self._cls == Workflow:
@@ -69,22 +133,6 @@ class SubjectSet(PanoptesObject, Exportable):
         super(SubjectSet, self).__init__(raw, etag)
         if not self.metadata:
             self.metadata = {}
-            self._original_metadata = {}
-
-    def set_raw(self, raw, etag=None, loaded=True):
-        super(SubjectSet, self).set_raw(raw, etag, loaded)
-        if loaded and self.metadata:
-            self._original_metadata = deepcopy(self.metadata)
-
-    def save(self):
-        """
-        Adds subject set metadata dict to the list of
-        savable attributes if it has changed.
-        """
-        if not self.metadata == self._original_metadata:
-            self.modified_attributes.add('metadata')
-
-        super(SubjectSet, self).save()
 
     @property
     def subjects(self):
@@ -127,20 +175,78 @@ class SubjectSet(PanoptesObject, Exportable):
 
         return self.links.subjects.remove(subjects)
 
-    def subject_workflow_statuses(self, workflow_id):
+    def subject_workflow_statuses(self, workflow_id, max_workers=4):
         """
         A generator which yields :py:class:`.SubjectWorkflowStatus` objects for subjects in this
         subject set and for the supplied workflow id.
 
+        Statuses are fetched in concurrent batches by
+        :py:meth:`.SubjectWorkflowStatus.for_subjects`.
+
         Examples::
 
             for status in subject_set.subject_workflow_statuses(1234):
                 print(status.retirement_reason)
         """
 
-        subject_ids = ', '.join((subject.id for subject in self.subjects))
-        for status in SubjectWorkflowStatus.where(subject_ids=subject_ids, workflow_id=workflow_id):
-            yield status
+        return SubjectWorkflowStatus.for_subjects(
+            (subject.id for subject in self.subjects),
+            workflow_id,
+            max_workers=max_workers,
+        )
+
+    def ingest(self, manifest, journal=None, location_columns=('location',),
+               key_column=None, max_workers=5, max_uploads=None,
+               link_batch_size=100, media_index=None):
+        """
+        Creates a subject for each row of a manifest, uploads its media and
+        links it to this subject set. Creating subjects, uploading media and
+        linking run at the same time, on separate threads.
+
+        - **manifest** is the path to a CSV file with a header row, or an
+          iterable of :py:class:`dict`.
+        - **journal** optional path to a file in which progress is recorded.
+          If an ingest is interrupted, running it again with the same
+          manifest and journal skips the rows which were already done. Rows
+          whose subjects were created but whose media wasn't uploaded have
+          it uploaded again, and rows which weren't linked are linked,
+          rather than creating their subjects again.
+        - **location_columns** are the columns which hold paths to local
+          media files (or, for :py:class:`dict` rows, anything accepted by
+          :py:meth:`.Subject.add_location`). Empty values are ignored.
+        - **key_column** is the column which uniquely identifies each row in
+          the journal. Defaults to the row number, in which case the
+          manifest's order must not change between runs.
+        - **max_workers** and **max_uploads** are passed to
+          :py:meth:`.Subject.async_saves`.
+        - **link_batch_size** is the number of subjects linked per request.
+        - **media_index** optional :py:class:`.MediaIndex`, or the path to
+          one, passed to :py:meth:`.Subject.add_location` so that files
+          which were already uploaded aren't uploaded again.
+
+        Every other column is added to each subject's metadata. The subjects
+        are linked to this subject set's project.
+
+        Returns an :py:class:`.IngestResult`, which includes the throughput
+        of each stage and any rows which failed.
+
+        Examples::
+
+            result = subject_set.ingest('manifest.csv', journal='ingest.log')
+            for key, exception in result.failed:
+                print(key, exception)
+        """
+        return ingest(
+            self,
+            manifest,
+            journal=journal,
+            location_columns=location_columns,
+            key_column=key_column,
+            max_workers=max_workers,
+            max_uploads=max_uploads,
+            link_batch_size=link_batch_size,
+            media_index=media_index,
+        )
 
     def __contains__(self, subject):
         """
@@ -151,6 +257,18 @@ class SubjectSet(PanoptesObject, Exportable):
         """
         return subject in self.links.subjects
 
+    def contains_many(self, subjects, max_workers=None):
+        """
+        A wrapper around :py:meth:`.SubjectSetLinkCollection.contains_many`.
+        Equivalent to::
+
+            subject_set.links.subjects.contains_many(subjects)
+        """
+        return self.links.subjects.contains_many(
+            subjects,
+            max_workers=max_workers,
+        )
+
 
 LinkResolver.register(SubjectSet)
 LinkResolver.register(SubjectSet, 'subject_set')
@@ -1,4 +1,8 @@
-from panoptes_client.panoptes import PanoptesObject
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from panoptes_client.panoptes import Panoptes, PanoptesObject
+from panoptes_client.utils import split_ids
 
 
 class SubjectWorkflowStatus(PanoptesObject):
@@ -25,3 +29,56 @@ class SubjectWorkflowStatus(PanoptesObject):
     """
     _api_slug = 'subject_workflow_statuses'
     _edit_attributes = {}
+
+    @classmethod
+    def for_subjects(cls, subject_ids, workflow_id, max_workers=4):
+        """
+        A generator which yields the :py:class:`.SubjectWorkflowStatus`
+        objects for the given subjects and workflow.
+
+        - **subject_ids** is any iterable of subject IDs or
+          :py:class:`.Subject` instances. It is consumed lazily.
+        - **workflow_id** is the ID of the workflow.
+        - **max_workers** is the maximum number of requests to send
+          concurrently.
+
+        The subject IDs are sent in the query string, so they're split into
+        batches of up to one page of results, which are also kept within
+        :py:data:`.MAX_ID_LIST_LENGTH` characters. Statuses are yielded in the
+        order of the batches.
+
+        Examples::
+
+            for status in SubjectWorkflowStatus.for_subjects(
+                [1234, 5678],
+                workflow_id=42,
+            ):
+                print(status.retirement_reason)
+        """
+        client = Panoptes.client()
+
+        def fetch(batch):
+            with client:
+                return list(cls.where(
+                    subject_ids=','.join(
+                        str(getattr(subject, 'id', subject))
+                        for subject in batch
+                    ),
+                    workflow_id=workflow_id,
+                    page_size=len(batch),
+                ))
+
+        in_flight = collections.deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for batch in split_ids(subject_ids):
+                    in_flight.append(executor.submit(fetch, batch))
+                    if len(in_flight) >= max_workers * 2:
+                        for status in in_flight.popleft().result():
+                            yield status
+                while in_flight:
+                    for status in in_flight.popleft().result():
+                        yield status
+            finally:
+                for future in in_flight:
+                    future.cancel()
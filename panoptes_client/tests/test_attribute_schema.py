@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+
+from panoptes_client.panoptes import (
+    AttributeSchema,
+    PanoptesObject,
+    ReadOnlyAttributeException,
+)
+from panoptes_client.subject import Subject
+from panoptes_client.subject_set import SubjectSet
+from panoptes_client.workflow import Workflow
+
+
+class TestAttributeSchema(unittest.TestCase):
+    def test_compile(self):
+        schema = AttributeSchema(Workflow._edit_attributes)
+        self.assertIn('tasks', schema.keys)
+        self.assertEqual(schema.nested[0][0], 'links')
+        self.assertEqual(schema.nested[0][1].keys, ('project',))
+        self.assertNotIn('links', schema.editable)
+
+    def test_new_raw(self):
+        schema = AttributeSchema(Subject._edit_attributes)
+        self.assertEqual(schema.new_raw(), {
+            'locations': None,
+            'metadata': None,
+            'links': {'project': None},
+        })
+
+    def test_new_raw_returns_copies(self):
+        schema = AttributeSchema(Subject._edit_attributes)
+        first = schema.new_raw()
+        first['links']['project'] = 1
+        self.assertIsNone(schema.new_raw()['links']['project'])
+
+    def test_new_raw_empty_nested(self):
+        schema = AttributeSchema(('name', {'links': ()}))
+        self.assertEqual(schema.new_raw(), {'name': None})
+
+    def test_compiled_once_per_class(self):
+        self.assertIs(
+            Subject._attribute_schema(),
+            Subject._attribute_schema(),
+        )
+        self.assertIsNot(
+            Subject._attribute_schema(),
+            SubjectSet._attribute_schema(),
+        )
+
+    def test_set_raw_does_not_walk_attributes(self):
+        with patch.object(PanoptesObject, '_savable_dict') as savable_dict:
+            subject = Subject({'id': '1', 'metadata': {'a': 1}})
+        savable_dict.assert_not_called()
+        self.assertEqual(subject.metadata, {'a': 1})
+        self.assertEqual(subject.raw['links'], {'project': None})
+
+    def test_savable_dict_modified(self):
+        subject_set = SubjectSet({
+            'id': '1',
+            'display_name': 'Name',
+            'metadata': {'a': 1},
+        })
+        subject_set.display_name = 'New name'
+        self.assertEqual(
+            subject_set._savable_dict(
+                modified_attributes=subject_set.modified_attributes
+            ),
+            {'display_name': 'New name'},
+        )
+
+    def test_savable_dict_links(self):
+        subject_set = SubjectSet({
+            'id': '1',
+            'metadata': {'a': 1},
+            'links': {'project': '2'},
+        })
+        subject_set.links.project = 3
+        self.assertEqual(
+            subject_set._savable_dict(
+                modified_attributes=subject_set.modified_attributes
+            ),
+            {'links': {'project': 3}},
+        )
+
+    def test_read_only_attribute(self):
+        subject = Subject({'id': '1', 'created_at': 'today'})
+        with self.assertRaises(ReadOnlyAttributeException):
+            subject.created_at = 'tomorrow'
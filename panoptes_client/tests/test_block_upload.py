@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree
+
+import requests
+
+from panoptes_client.subject import MediaFile, Subject
+
+
+class FakeBlobStore(object):
+    """
+    A local HTTP server which accepts Put Block and Put Block List requests
+    for signed blob URLs, and can be told to fail some blocks.
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.blobs = {}
+        self.content_types = {}
+        self.block_requests = []
+        self.fail_offsets = set()
+        self.lock = threading.Lock()
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_PUT(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                status = store.handle(url.path, query, self.headers, body)
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def handle(self, path, query, headers, body):
+        assert query['sig'] == ['abc']
+        comp = query.get('comp', [None])[0]
+        with self.lock:
+            if comp == 'block':
+                block_id = query['blockid'][0]
+                self.block_requests.append(block_id)
+                if block_id in self.fail_offsets:
+                    return 500
+                self.blocks[(path, block_id)] = body
+                return 201
+            if comp == 'blocklist':
+                block_ids = [
+                    element.text
+                    for element in ElementTree.fromstring(body)
+                ]
+                self.blobs[path] = b''.join(
+                    self.blocks[(path, block_id)] for block_id in block_ids
+                )
+                self.content_types[path] = headers['x-ms-blob-content-type']
+                return 201
+            self.blobs[path] = body
+            return 201
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+@patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+@patch('panoptes_client.subject.BLOCK_UPLOAD_SIZE', 1000)
+@patch('panoptes_client.subject.BLOCK_UPLOAD_THRESHOLD', 2000)
+class TestBlockUpload(unittest.TestCase):
+    def setUp(self):
+        self.store = FakeBlobStore()
+        self.addCleanup(self.store.stop)
+        self.client = Mock()
+        self.client.upload_session.return_value = requests.Session()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def media_file(self, size):
+        path = os.path.join(self.dir, 'video.mp4')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        return MediaFile(path=path)
+
+    def upload(self, media_file):
+        Subject()._upload_media(
+            self.store.url + '/blob?sig=abc',
+            media_file,
+            'video/mp4',
+            self.client,
+        )
+
+    def test_small_file_single_put(self):
+        media_file = self.media_file(1500)
+        self.upload(media_file)
+        self.assertEqual(self.store.block_requests, [])
+        self.assertEqual(self.store.blobs['/blob'], media_file.read())
+
+    def test_large_file_in_blocks(self):
+        media_file = self.media_file(5500)
+        self.upload(media_file)
+        self.assertEqual(len(self.store.block_requests), 6)
+        self.assertEqual(self.store.blobs['/blob'], media_file.read())
+        self.assertEqual(self.store.content_types['/blob'], 'video/mp4')
+        self.assertEqual(media_file.uploaded_blocks, {})
+
+    def test_resume_uploads_only_failed_blocks(self):
+        media_file = self.media_file(5500)
+        self.store.fail_offsets = {'MDAwMDAwMjAwMA=='}  # Offset 2000
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.upload(media_file)
+        self.assertNotIn('/blob', self.store.blobs)
+        self.assertEqual(len(self.store.block_requests), 6)
+
+        self.store.fail_offsets = set()
+        self.upload(media_file)
+        self.assertEqual(
+            self.store.block_requests[6:],
+            ['MDAwMDAwMjAwMA=='],
+        )
+        self.assertEqual(self.store.blobs['/blob'], media_file.read())
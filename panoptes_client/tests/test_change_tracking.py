@@ -0,0 +1,215 @@
+import copy
+import json
+import pickle
+import unittest
+from unittest.mock import patch
+
+from panoptes_client.panoptes import ChangeTrackingDict, ChangeTrackingList
+from panoptes_client.subject import Subject
+from panoptes_client.workflow import Workflow
+
+
+def loaded_workflow():
+    return Workflow({
+        'id': '1',
+        'display_name': 'Workflow',
+        'configuration': {'hide_classification_summaries': True},
+        'retirement': {'criteria': 'classification_count'},
+        'tasks': {
+            'T0': {
+                'type': 'single',
+                'answers': [{'label': 'Yes'}, {'label': 'No'}],
+            },
+        },
+    }, etag='abc')
+
+
+class TestChangeTracking(unittest.TestCase):
+    def test_load_does_not_copy_nested(self):
+        raw = {
+            'id': '1',
+            'locations': [{'image/png': 'https://example.com/1.png'}],
+            'metadata': {'a': {'b': 1}},
+        }
+        subject = Subject(raw)
+        self.assertIs(
+            dict.__getitem__(subject.raw['metadata'], 'a'),
+            raw['metadata']['a'],
+        )
+        self.assertEqual(subject.modified_attributes, set())
+
+    def test_read_does_not_modify(self):
+        workflow = loaded_workflow()
+        for task in workflow.tasks.values():
+            for answer in task['answers']:
+                answer.get('label')
+        self.assertEqual(workflow.modified_attributes, set())
+
+    def test_wrapped_on_access(self):
+        workflow = loaded_workflow()
+        self.assertIsInstance(workflow.tasks, ChangeTrackingDict)
+        self.assertIsInstance(
+            workflow.tasks['T0']['answers'],
+            ChangeTrackingList,
+        )
+        self.assertEqual(type(workflow.display_name), str)
+
+    def test_top_level_change(self):
+        workflow = loaded_workflow()
+        workflow.configuration['hide_classification_summaries'] = False
+        self.assertEqual(workflow.modified_attributes, {'configuration'})
+
+    def test_nested_dict_change(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_nested_list_change(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']['answers'].append({'label': 'Maybe'})
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_iteration(self):
+        workflow = loaded_workflow()
+        for answer in workflow.tasks['T0']['answers']:
+            answer['label'] = answer['label'].upper()
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_items(self):
+        workflow = loaded_workflow()
+        for _, task in workflow.tasks.items():
+            task.pop('type')
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_dict_copy(self):
+        workflow = loaded_workflow()
+        dict(workflow.tasks)['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_unpacked_dict(self):
+        workflow = loaded_workflow()
+        {**workflow.tasks}['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_copy_method(self):
+        workflow = loaded_workflow()
+        tasks = workflow.tasks.copy()
+        self.assertIs(type(tasks), dict)
+        tasks['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_shallow_copy(self):
+        workflow = loaded_workflow()
+        copy.copy(workflow.tasks)['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+        self.assertEqual(
+            workflow.modified_paths,
+            {('tasks', 'T0', 'type')},
+        )
+
+    def test_change_via_merged_dict(self):
+        workflow = loaded_workflow()
+        ({} | workflow.tasks)['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_reversed(self):
+        workflow = loaded_workflow()
+        for answer in reversed(workflow.tasks['T0']['answers']):
+            answer['label'] = answer['label'].upper()
+        self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_change_via_list_copies(self):
+        for make_copy in (
+            lambda answers: answers.copy(),
+            copy.copy,
+            lambda answers: answers + [],
+            lambda answers: answers * 1,
+        ):
+            workflow = loaded_workflow()
+            make_copy(workflow.tasks['T0']['answers'])[0]['label'] = 'Y'
+            self.assertEqual(workflow.modified_attributes, {'tasks'})
+
+    def test_copy_save_sends_change(self):
+        workflow = loaded_workflow()
+        workflow.tasks.copy()['T0']['type'] = 'multiple'
+        with patch('panoptes_client.panoptes.Panoptes') as pc:
+            pc.client().put.return_value = (
+                {'workflows': [{'id': '1'}]},
+                'def',
+            )
+            workflow.save()
+            pc.client().put.assert_called_once()
+
+    def test_copies_are_plain(self):
+        workflow = loaded_workflow()
+        tasks = workflow.tasks
+        self.assertIs(type(copy.copy(tasks)), dict)
+        self.assertIs(type(copy.deepcopy(tasks)), dict)
+        self.assertIs(type(copy.deepcopy(tasks)['T0']['answers']), list)
+        self.assertIs(type(pickle.loads(pickle.dumps(tasks))), dict)
+        copy.deepcopy(tasks)['T0']['type'] = 'multiple'
+        self.assertEqual(workflow.modified_attributes, set())
+
+    def test_json_serialisable(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']['answers'][0]['label'] = 'Y'
+        self.assertEqual(
+            json.loads(json.dumps(workflow.tasks)),
+            {
+                'T0': {
+                    'type': 'single',
+                    'answers': [{'label': 'Y'}, {'label': 'No'}],
+                },
+            },
+        )
+
+    def test_save_unchanged(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']
+        with patch('panoptes_client.panoptes.Panoptes') as pc:
+            workflow.save()
+            pc.client().put.assert_not_called()
+
+    def test_save_changed(self):
+        workflow = loaded_workflow()
+        workflow.retirement['options'] = {'count': 5}
+        with patch('panoptes_client.panoptes.Panoptes') as pc:
+            pc.client().put.return_value = (
+                {'workflows': [{'id': '1'}]},
+                'def',
+            )
+            workflow.save()
+            pc.client().put.assert_called_with(
+                '/workflows/1',
+                json={'workflows': {'retirement': {
+                    'criteria': 'classification_count',
+                    'options': {'count': 5},
+                }}},
+                etag='abc',
+            )
+
+    def test_modified_paths(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']['type'] = 'multiple'
+        workflow.tasks['T0']['answers'][1]['label'] = 'Nope'
+        workflow.configuration.setdefault('hide_classification_summaries')
+        workflow.display_name = 'Renamed'
+        self.assertEqual(workflow.modified_paths, {
+            ('tasks', 'T0', 'type'),
+            ('tasks', 'T0', 'answers', 1, 'label'),
+            ('display_name',),
+        })
+
+    def test_modified_list_path(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']['answers'].insert(0, {'label': 'Maybe'})
+        self.assertEqual(
+            workflow.modified_paths,
+            {('tasks', 'T0', 'answers')},
+        )
+
+    def test_modified_paths_reset_on_load(self):
+        workflow = loaded_workflow()
+        workflow.tasks['T0']['type'] = 'multiple'
+        workflow.set_raw({'id': '1', 'tasks': {}})
+        self.assertEqual(workflow.modified_paths, set())
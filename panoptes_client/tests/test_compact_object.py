@@ -0,0 +1,103 @@
+import tracemalloc
+import unittest
+
+from panoptes_client.panoptes import (
+    CompactPanoptesObject,
+    LinkCollection,
+    ReadOnlyAttributeException,
+    ResultPaginator,
+)
+from panoptes_client.subject import Subject
+
+
+def subject_page(count):
+    return {
+        'subjects': [
+            {
+                'id': str(i),
+                'locations': [{'image/png': 'https://example.com/{}.png'.format(i)}],
+                'metadata': {'filename': '{}.png'.format(i), 'n': i},
+                'links': {
+                    'project': '1',
+                    'subject_sets': ['10', '11'],
+                },
+            }
+            for i in range(count)
+        ],
+    }
+
+
+class TestCompactPanoptesObject(unittest.TestCase):
+    def setUp(self):
+        self.raw = subject_page(1)['subjects'][0]
+        self.obj = CompactPanoptesObject(Subject, self.raw, etag='abc')
+
+    def test_attributes(self):
+        self.assertEqual(self.obj.id, '0')
+        self.assertEqual(self.obj.metadata, self.raw['metadata'])
+        self.assertEqual(self.obj.etag, 'abc')
+        self.assertEqual(repr(self.obj), '<Subject 0>')
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.obj.display_name
+
+    def test_missing_id(self):
+        self.assertIsNone(CompactPanoptesObject(Subject, {}).id)
+
+    def test_read_only(self):
+        with self.assertRaises(ReadOnlyAttributeException):
+            self.obj.metadata = {}
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.obj, '__dict__'))
+
+    def test_links_created_lazily(self):
+        self.assertIsNone(self.obj._links)
+        self.assertIs(self.obj.links, self.obj.links)
+
+    def test_link_collection(self):
+        subject_sets = self.obj.links.subject_sets
+        self.assertIsInstance(subject_sets, LinkCollection)
+        self.assertIn('10', subject_sets)
+
+    def test_materialize(self):
+        subject = self.obj.materialize()
+        self.assertIsInstance(subject, Subject)
+        self.assertEqual(subject.id, '0')
+        self.assertEqual(subject.metadata, self.raw['metadata'])
+        self.assertEqual(subject.etag, 'abc')
+
+
+class TestCompactPaginator(unittest.TestCase):
+    def test_compact_results(self):
+        paginator = ResultPaginator(Subject, subject_page(3), 'abc', compact=True)
+        results = list(paginator)
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, CompactPanoptesObject)
+
+    def test_default_results(self):
+        paginator = ResultPaginator(Subject, subject_page(3), 'abc')
+        for result in paginator:
+            self.assertIsInstance(result, Subject)
+
+    def test_memory_per_object(self):
+        count = 2000
+
+        def allocated_per_object(compact):
+            page = subject_page(count)
+            tracemalloc.start()
+            try:
+                objects = list(
+                    ResultPaginator(Subject, page, 'abc', compact=compact)
+                )
+                allocated = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(len(objects), count)
+            return allocated / count
+
+        full = allocated_per_object(compact=False)
+        compact = allocated_per_object(compact=True)
+        self.assertLess(compact * 4, full)
@@ -0,0 +1,208 @@
+import csv
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from panoptes_client.ingest import IngestJournal
+from panoptes_client.panoptes import PanoptesAPIException
+from panoptes_client.subject_set import SubjectSet
+
+
+class FakeAPI(object):
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.created = []
+        self.linked = []
+        self.updated = []
+        self.fail_links = False
+        self.lock = threading.Lock()
+
+    def get(self, path, *args, **kwargs):
+        if path.startswith('/subjects/'):
+            subject = self.created[int(path.split('/')[2]) - 1]
+            return {'subjects': [dict(subject)]}, 'abc'
+        return (
+            {'subject_sets': [{
+                'id': '1',
+                'metadata': {'a': 1},
+                'links': {'project': '10'},
+            }]},
+            'abc',
+        )
+
+    def post(self, path, params=None, headers=None, json=None, **kwargs):
+        if path == '/subject_sets/1/links/subjects':
+            if self.fail_links:
+                raise PanoptesAPIException('Link failed')
+            self.linked.extend(json['subjects'])
+            return None, None
+
+        with self.lock:
+            subject = dict(json['subjects'], id=str(next(self.ids)))
+        self.created.append(subject)
+        subject['locations'] = [
+            location if isinstance(location, dict)
+            else {location: 'https://example.com/upload'}
+            for location in subject['locations']
+        ]
+        return {'subjects': [subject]}, 'abc'
+
+    def put(self, path, params=None, headers=None, json=None, **kwargs):
+        with self.lock:
+            self.updated.append(path)
+        subject = dict(
+            self.created[int(path.split('/')[2]) - 1],
+            locations=[
+                location if isinstance(location, dict)
+                else {location: 'https://example.com/upload'}
+                for location in json['subjects']['locations']
+            ],
+        )
+        return {'subjects': [subject]}, 'abc'
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        pc = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('panoptes_client.ingest.Panoptes', pc)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pc.client()
+        self.client.object_cache = None
+        self.api = FakeAPI()
+        self.client.get.side_effect = self.api.get
+        self.client.post.side_effect = self.api.post
+        self.client.put.side_effect = self.api.put
+
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.journal = os.path.join(self.dir, 'journal')
+        self.manifest = os.path.join(self.dir, 'manifest.csv')
+        with open(self.manifest, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'location'])
+            for i in range(25):
+                path = os.path.join(self.dir, '{}.png'.format(i))
+                with open(path, 'wb') as image:
+                    image.write('image {}'.format(i).encode())
+                writer.writerow(['subject {}'.format(i), path])
+
+    def subject_set(self):
+        return SubjectSet(1)
+
+    @patch('panoptes_client.subject.MEDIA_TYPE_DETECTION', 'mimetypes')
+    def test_ingest_manifest(self):
+        result = self.subject_set().ingest(
+            self.manifest,
+            journal=self.journal,
+            link_batch_size=10,
+        )
+        self.assertEqual(len(self.api.created), 25)
+        self.assertEqual(
+            sorted(subject['metadata']['name'] for subject in self.api.created),
+            sorted('subject {}'.format(i) for i in range(25)),
+        )
+        self.assertEqual(self.api.created[0]['links'], {'project': '10'})
+        self.assertEqual(sorted(self.api.linked, key=int), [
+            str(i) for i in range(1, 26)
+        ])
+        self.assertEqual(self.client.upload_session().put.call_count, 25)
+        self.assertEqual(result.stages['create'].count, 25)
+        self.assertEqual(result.stages['upload'].count, 25)
+        self.assertEqual(result.stages['link'].count, 25)
+        self.assertEqual(len(result.subject_ids), 25)
+        self.assertEqual(result.failed, [])
+
+    @patch('panoptes_client.subject.MEDIA_TYPE_DETECTION', 'mimetypes')
+    def test_resume_does_not_duplicate(self):
+        self.api.fail_links = True
+        result = self.subject_set().ingest(self.manifest, journal=self.journal)
+        self.assertEqual(len(self.api.created), 25)
+        self.assertEqual(len(result.failed), 25)
+
+        self.api.fail_links = False
+        result = self.subject_set().ingest(self.manifest, journal=self.journal)
+        self.assertEqual(len(self.api.created), 25)
+        self.assertEqual(len(self.api.linked), 25)
+        self.assertEqual(result.failed, [])
+
+        result = self.subject_set().ingest(self.manifest, journal=self.journal)
+        self.assertEqual(result.skipped, 25)
+        self.assertEqual(len(self.api.created), 25)
+        self.assertEqual(len(self.api.linked), 25)
+
+    @patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+    @patch('panoptes_client.subject.MEDIA_TYPE_DETECTION', 'mimetypes')
+    def test_resume_after_failed_upload(self):
+        put = self.client.upload_session().put
+        put.side_effect = requests.exceptions.ConnectionError
+        result = self.subject_set().ingest(self.manifest, journal=self.journal)
+        self.assertEqual(len(self.api.created), 25)
+        self.assertEqual(len(result.failed), 25)
+        self.assertEqual(self.api.linked, [])
+        self.assertEqual(len(IngestJournal(self.journal).created), 25)
+
+        put.side_effect = None
+        put.reset_mock()
+        result = self.subject_set().ingest(self.manifest, journal=self.journal)
+        self.assertEqual(result.failed, [])
+        self.assertEqual(len(self.api.created), 25)
+        self.assertEqual(len(self.api.updated), 25)
+        self.assertEqual(put.call_count, 25)
+        self.assertEqual(len(self.api.linked), 25)
+
+    def test_dict_rows_and_key_column(self):
+        rows = [
+            {
+                'key': 'a',
+                'location': {'image/png': 'https://example.com/a.png'},
+                'n': 1,
+            },
+            {'key': 'b', 'location': None, 'n': 2},
+        ]
+        result = self.subject_set().ingest(
+            rows,
+            journal=self.journal,
+            key_column='key',
+        )
+        self.assertEqual(sorted(result.subject_ids), ['a', 'b'])
+        self.assertEqual(
+            sorted(subject['metadata']['n'] for subject in self.api.created),
+            [1, 2],
+        )
+        self.assertEqual(IngestJournal(self.journal).linked, {'a', 'b'})
+
+    def test_journal_ignores_partial_line(self):
+        with open(self.journal, 'w') as f:
+            f.write('{"created": "1", "subject": "5"}\n{"linked": ["1"')
+        journal = IngestJournal(self.journal)
+        self.assertEqual(journal.created, {'1': '5'})
+        self.assertEqual(journal.linked, set())
+        journal.record_created('2', '6')
+        journal.close()
+
+        journal = IngestJournal(self.journal)
+        self.assertEqual(journal.created, {'1': '5', '2': '6'})
+        journal.close()
+
+    @patch('panoptes_client.subject.MEDIA_TYPE_DETECTION', 'mimetypes')
+    def test_media_index_skips_uploaded_media(self):
+        index = os.path.join(self.dir, 'index')
+        self.subject_set().ingest(self.manifest, media_index=index)
+        self.assertEqual(self.client.upload_session().put.call_count, 25)
+
+        result = self.subject_set().ingest(self.manifest, media_index=index)
+        self.assertEqual(self.client.upload_session().put.call_count, 25)
+        self.assertEqual(result.stages['create'].count, 25)
+        self.assertEqual(
+            self.api.created[-1]['locations'],
+            [{'image/png': 'https://example.com/upload'}],
+        )
@@ -242,3 +242,45 @@ class TestLinkCollection(unittest.TestCase):
         lc = self.link_collection(parent=parent)[0]
         with self.assertRaises(ObjectNotSavedException):
             lc.remove(1)
+
+    def test_add_duplicates_once(self):
+        lc, parent, slug = self.link_collection(['1'])
+        lc.add(['1', '2', 2, MockPanoptesObject(3), '3'])
+        parent.http_post.assert_called_with(
+            '{}/links/{}'.format(parent.id, slug),
+            json={slug: ['2', '3']},
+            retry=True,
+        )
+        self.assertEqual([obj.id for obj in lc], ['1', '2', '3'])
+
+    def test_remove_then_add(self):
+        lc = self.link_collection()[0]
+        lc.remove(['1', '3'])
+        self.assertNotIn('1', lc)
+        lc.add('1')
+        self.assertEqual([obj.id for obj in lc], ['2', '4', '1'])
+        self.assertEqual(lc[2].id, '1')
+
+    def test_large_collection(self):
+        ids = [str(i) for i in range(100000)]
+        lc, parent, slug = self.link_collection(ids)
+        lc.add(list(range(100000, 110000)))
+        lc.remove(list(range(0, 10000)))
+        self.assertEqual(parent.http_post.call_count, 100)
+        self.assertEqual(parent.http_delete.call_count, 100)
+        self.assertNotIn(0, lc)
+        self.assertIn(109999, lc)
+        self.assertEqual(lc[0].id, '10000')
+        self.assertEqual(
+            sum(1 for _ in lc._ordered_ids()),
+            100000,
+        )
+
+    def test_remove_long_ids_split_by_url_length(self):
+        ids = [str(i) * 500 for i in range(1, 10)]
+        lc, parent, slug = self.link_collection(ids)
+        lc.remove(ids)
+        self.assertEqual(parent.http_delete.call_count, 2)
+        for call in parent.http_delete.call_args_list:
+            self.assertLessEqual(len(call[0][0].split('/')[-1]), 4000)
+        self.assertEqual(list(lc), [])
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import requests
+
+from panoptes_client.media_cache import MediaCache
+from panoptes_client.subject import Subject
+
+
+class FakeMediaHost(object):
+    """
+    A local HTTP server which serves files, including byte ranges.
+    """
+
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+        self.lock = threading.Lock()
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with host.lock:
+                    host.requests.append((self.path, self.headers['Range']))
+                body = host.files.get(self.path.split('?')[0])
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                status = 200
+                if self.headers['Range']:
+                    start = int(self.headers['Range'][6:-1])
+                    body = body[start:]
+                    status = 206
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+@patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+class TestDownload(unittest.TestCase):
+    def setUp(self):
+        self.files = {
+            '/a.png': os.urandom(3000),
+            '/b.png': os.urandom(2000),
+        }
+        self.files['/copy.png'] = self.files['/a.png']
+        self.host = FakeMediaHost(self.files)
+        self.addCleanup(self.host.stop)
+        self.client = Mock()
+        self.client.upload_session.return_value = requests.Session()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def subject(self, subject_id, *paths):
+        return Subject({
+            'id': subject_id,
+            'locations': [
+                {'image/png': self.host.url + path} for path in paths
+            ],
+        })
+
+    def download(self, subjects):
+        return Subject.download_many(subjects, self.dir, client=self.client)
+
+    def test_download_many(self):
+        result = self.download([
+            self.subject('1', '/a.png', '/b.png'),
+            self.subject('2', '/a.png?sig=1', '/copy.png'),
+        ])
+
+        self.assertEqual(result.failed, [])
+        self.assertEqual(result.downloaded + result.skipped, 4)
+        self.assertEqual(len(self.host.requests), 3)
+        a_path, b_path = result.paths['1']
+        self.assertEqual(result.paths['2'], [a_path, a_path])
+        with open(b_path, 'rb') as f:
+            self.assertEqual(f.read(), self.files['/b.png'])
+        self.assertEqual(
+            os.path.basename(a_path),
+            hashlib.sha256(self.files['/a.png']).hexdigest(),
+        )
+
+        result = self.download([self.subject('1', '/a.png', '/b.png')])
+        self.assertEqual(result.skipped, 2)
+        self.assertEqual(result.bytes_downloaded, 0)
+        self.assertEqual(len(self.host.requests), 3)
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_unloaded_subjects_fetched_in_batches(self, mock_panoptes):
+        api = mock_panoptes.client()
+        api.object_cache = None
+        api.get.return_value = ({
+            'subjects': [
+                self.subject('1', '/a.png').raw,
+                self.subject('2', '/b.png').raw,
+            ],
+        }, 'etag')
+
+        result = self.download([Subject(1), Subject(2)])
+
+        api.get.assert_called_once()
+        self.assertEqual(api.get.call_args[0][0], '/subjects/1,2')
+        self.assertEqual(result.downloaded, 2)
+        self.assertEqual(sorted(result.paths), [1, 2])
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_missing_subject_reported(self, mock_panoptes):
+        api = mock_panoptes.client()
+        api.object_cache = None
+        api.get.return_value = ({
+            'subjects': [self.subject('1', '/a.png').raw],
+        }, 'etag')
+
+        result = self.download([Subject(1), Subject(2)])
+
+        api.get.assert_called_once()
+        self.assertEqual(result.downloaded, 1)
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual(result.failed[0][:2], (2, None))
+        self.assertNotIn(2, result.paths)
+
+    def test_resumes_partial_download(self):
+        cache = MediaCache(self.dir)
+        partial_path = os.path.join(
+            self.dir,
+            'partial',
+            hashlib.sha256(
+                (self.host.url + '/a.png').encode()
+            ).hexdigest(),
+        )
+        with open(partial_path, 'wb') as f:
+            f.write(self.files['/a.png'][:1000])
+
+        path, downloaded = cache.download(self.host.url + '/a.png')
+        cache.close()
+
+        self.assertEqual(downloaded, 2000)
+        self.assertEqual(self.host.requests, [('/a.png', 'bytes=1000-')])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), self.files['/a.png'])
+        self.assertFalse(os.path.exists(partial_path))
+
+    def test_partial_index_line_removed(self):
+        with open(os.path.join(self.dir, 'index'), 'w') as f:
+            f.write('{"url": "http://example.com/a.png", "sha')
+        cache = MediaCache(self.dir)
+        cache.download(self.host.url + '/b.png')
+        cache.close()
+
+        cache = MediaCache(self.dir)
+        self.addCleanup(cache.close)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(self.host.url + '/b.png'))
+
+    def test_failures(self):
+        subject = self.subject('1', '/a.png', '/missing.png')
+        result = self.download([subject])
+        self.assertEqual(result.downloaded, 1)
+        self.assertEqual(result.paths['1'][1], None)
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual(result.failed[0][:2], (
+            '1',
+            self.host.url + '/missing.png',
+        ))
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            subject.download_locations(self.dir, client=self.client)
@@ -0,0 +1,169 @@
+import unittest
+from unittest.mock import patch
+
+from panoptes_client.panoptes import ObjectCache
+from panoptes_client.subject import Subject
+from panoptes_client.subject_set import SubjectSet
+
+
+def subject_response(*ids):
+    return {
+        'subjects': [
+            {
+                'id': str(_id),
+                'locations': [{'image/png': 'https://example.com/1.png'}],
+                'metadata': {'n': _id},
+            }
+            for _id in ids
+        ],
+    }
+
+
+class TestObjectCache(unittest.TestCase):
+    def test_get_missing(self):
+        cache = ObjectCache()
+        self.assertIsNone(cache.get(Subject, 1))
+        self.assertIsNone(cache.get(Subject, None))
+
+    def test_add_and_get(self):
+        cache = ObjectCache()
+        subject = Subject({'id': '1'})
+        cache.add(subject)
+        self.assertIs(cache.get(Subject, 1), subject)
+        self.assertIs(cache.get(Subject, '1'), subject)
+        self.assertIsNone(cache.get(SubjectSet, 1))
+        self.assertIn(subject, cache)
+
+    def test_unsaved_objects_ignored(self):
+        cache = ObjectCache()
+        cache.add(Subject())
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = ObjectCache(max_size=2)
+        subjects = [Subject({'id': str(i)}) for i in range(1, 4)]
+        cache.add(subjects[0])
+        cache.add(subjects[1])
+        cache.get(Subject, 1)
+        cache.add(subjects[2])
+        self.assertIs(cache.get(Subject, 1), subjects[0])
+        self.assertIsNone(cache.get(Subject, 2))
+        self.assertIs(cache.get(Subject, 3), subjects[2])
+
+    @patch('panoptes_client.panoptes.time')
+    def test_ttl(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        cache = ObjectCache(ttl=10)
+        subject = Subject({'id': '1'})
+        cache.add(subject)
+        mock_time.monotonic.return_value = 109
+        self.assertIs(cache.get(Subject, 1), subject)
+        mock_time.monotonic.return_value = 110
+        self.assertIsNone(cache.get(Subject, 1))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        cache = ObjectCache()
+        cache.add(Subject({'id': '1'}))
+        cache.add(Subject({'id': '2'}))
+        cache.add(SubjectSet({'id': '1'}))
+        cache.invalidate(Subject, 1)
+        self.assertIsNone(cache.get(Subject, 1))
+        self.assertEqual(len(cache), 2)
+        cache.invalidate(Subject)
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+class TestObjectCacheIntegration(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        self.client = patcher.start().client()
+        self.addCleanup(patcher.stop)
+        self.client.object_cache = ObjectCache()
+
+    def test_find_fetches_once(self):
+        self.client.get.return_value = (subject_response(1), 'abc')
+        first = Subject.find(1)
+        second = Subject.find(1)
+        self.assertIs(first, second)
+        self.assertEqual(self.client.get.call_count, 1)
+
+    def test_where_yields_canonical_instances(self):
+        self.client.get.return_value = (subject_response(1, 2), 'abc')
+        first = list(Subject.where())
+        second = list(Subject.where())
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+
+    def test_where_keeps_unsaved_changes(self):
+        self.client.get.return_value = (subject_response(1), 'abc')
+        subject = next(Subject.where())
+        subject.metadata['n'] = 'changed'
+        self.assertIs(next(Subject.where()), subject)
+        self.assertEqual(subject.metadata['n'], 'changed')
+
+    def test_lazy_load_uses_cache(self):
+        self.client.get.return_value = (subject_response(1), 'abc')
+        Subject.find(1)
+        subject = Subject(1)
+        self.assertEqual(subject.metadata, {'n': 1})
+        self.assertEqual(self.client.get.call_count, 1)
+
+    def test_lazy_load_does_not_share_changes(self):
+        self.client.get.return_value = (subject_response(1), 'abc')
+        cached = Subject.find(1)
+        cached.metadata
+        subject = Subject(1)
+        subject.metadata['n'] = 'changed'
+        self.assertEqual(cached.metadata, {'n': 1})
+        self.assertEqual(cached.modified_attributes, set())
+
+    def test_save_updates_cache(self):
+        self.client.post.return_value = (subject_response(5), 'abc')
+        subject = Subject()
+        subject.links.project = 1
+        subject.save()
+        self.assertIs(Subject.find(5), subject)
+        self.client.get.assert_not_called()
+
+    def test_reload_keeps_canonical_instance(self):
+        self.client.get.return_value = (subject_response(1), 'abc')
+        subject = Subject.find(1)
+        self.client.get.return_value = (
+            {'subjects': [dict(subject_response(1)['subjects'][0],
+                               metadata={'n': 'reloaded'})]},
+            'def',
+        )
+        subject.reload()
+        self.assertEqual(subject.metadata, {'n': 'reloaded'})
+        self.assertEqual(subject.etag, 'def')
+        self.assertIs(Subject.find(1), subject)
+        self.assertEqual(self.client.get.call_count, 2)
+
+    def test_lazy_load_does_not_share_links(self):
+        response = subject_response(1)
+        response['subjects'][0]['links'] = {
+            'project': '5',
+            'subject_sets': ['7'],
+        }
+        self.client.get.return_value = (response, 'abc')
+        cached = Subject.find(1)
+        cached.links.subject_sets
+        subject = Subject(1)
+        subject.links.project = 99
+        self.assertEqual(cached.raw['links']['project'], '5')
+        self.assertEqual(cached.modified_attributes, set())
+
+        subject_sets = subject.links.subject_sets
+        self.assertIsNot(subject_sets, cached.links.subject_sets)
+        self.assertIs(subject_sets._parent, subject)
+        self.assertIn('7', subject_sets)
+
+    def test_delete_invalidates(self):
+        self.client.get.return_value = (subject_response(1), 'abc')
+        subject = Subject.find(1)
+        with patch.object(Subject, 'http_delete'):
+            subject.delete()
+        self.assertIsNone(self.client.object_cache.get(Subject, 1))
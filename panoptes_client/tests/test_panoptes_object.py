@@ -0,0 +1,215 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from panoptes_client.panoptes import (
+    ObjectConflictException,
+    Panoptes,
+    PanoptesAPIException,
+)
+from panoptes_client.subject import Subject
+from panoptes_client.subject_set import SubjectSet
+
+
+def subject_set_response(display_name):
+    return (
+        {
+            'subject_sets': [{
+                'id': '1',
+                'display_name': display_name,
+                'metadata': {'a': 1},
+            }],
+        },
+        'new-etag',
+    )
+
+
+class TestSave(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        self.client = patcher.start().client()
+        self.addCleanup(patcher.stop)
+        self.client.object_cache = None
+        self.subject_set = SubjectSet({
+            'id': '1',
+            'display_name': 'Name',
+            'metadata': {'a': 1},
+        }, etag='old-etag')
+        self.client.put.return_value = subject_set_response('New name')
+        self.client.get.return_value = subject_set_response('Reloaded name')
+
+    def test_update_reloads_by_default(self):
+        self.client.reload_after_save = True
+        self.subject_set.display_name = 'New name'
+        self.subject_set.save()
+        self.assertEqual(self.subject_set.display_name, 'Reloaded name')
+        self.client.get.assert_called_once()
+
+    def test_update_trusts_response(self):
+        self.client.reload_after_save = False
+        self.subject_set.display_name = 'New name'
+        self.subject_set.save()
+        self.assertEqual(self.subject_set.display_name, 'New name')
+        self.assertEqual(self.subject_set.etag, 'new-etag')
+        self.assertEqual(self.subject_set.modified_attributes, set())
+        self.client.get.assert_not_called()
+
+
+class TestBulkSave(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes.client')
+        self.client = patcher.start()()
+        self.addCleanup(patcher.stop)
+        self.client.object_cache = None
+        self.client.reload_after_save = False
+        self.client.__enter__ = Mock(return_value=self.client)
+        self.client.__exit__ = Mock(return_value=None)
+
+    def subject_sets(self, count):
+        return [
+            SubjectSet({
+                'id': str(i),
+                'display_name': 'Set {}'.format(i),
+                'metadata': {'a': 1},
+            }, etag='etag-{}'.format(i))
+            for i in range(1, count + 1)
+        ]
+
+    def put(self, path, json, etag):
+        _id = path.split('/')[-1]
+        return (
+            {'subject_sets': [dict(json['subject_sets'], id=_id)]},
+            'new-' + etag,
+        )
+
+    def test_saves_deferred_until_exit(self):
+        self.client.put.side_effect = self.put
+        subject_sets = self.subject_sets(10)
+        with Panoptes.bulk(max_workers=3) as bulk:
+            for subject_set in subject_sets:
+                subject_set.display_name = 'Renamed'
+                subject_set.save()
+                subject_set.save()
+            self.client.put.assert_not_called()
+
+        self.assertEqual(self.client.put.call_count, 10)
+        self.assertEqual(len(bulk.succeeded), 10)
+        self.assertEqual(bulk.failed, [])
+        for subject_set in subject_sets:
+            self.assertEqual(subject_set.etag, 'new-etag-' + subject_set.id)
+
+    def test_not_saved_if_block_raises(self):
+        subject_set = self.subject_sets(1)[0]
+        with self.assertRaises(ValueError):
+            with Panoptes.bulk():
+                subject_set.display_name = 'Renamed'
+                subject_set.save()
+                raise ValueError
+        self.client.put.assert_not_called()
+
+    def test_failures_reported(self):
+        error = PanoptesAPIException('Invalid')
+        self.client.put.side_effect = error
+        subject_set = self.subject_sets(1)[0]
+        with Panoptes.bulk() as bulk:
+            subject_set.display_name = 'Renamed'
+            subject_set.save()
+        self.assertEqual(bulk.succeeded, [])
+        self.assertIs(bulk.failed[0].object, subject_set)
+        self.assertIs(bulk.failed[0].exception, error)
+
+    def test_conflict_reapplies_changes(self):
+        self.client.put.side_effect = [
+            ObjectConflictException('Conflict'),
+            self.put('/subject_sets/1', {'subject_sets': {
+                'display_name': 'Renamed',
+            }}, 'etag-2'),
+        ]
+        self.client.get.return_value = (
+            {'subject_sets': [{
+                'id': '1',
+                'display_name': 'Changed elsewhere',
+                'metadata': {'b': 2},
+            }]},
+            'etag-2',
+        )
+        subject_set = self.subject_sets(1)[0]
+        with Panoptes.bulk() as bulk:
+            subject_set.display_name = 'Renamed'
+            subject_set.save()
+
+        self.assertEqual(bulk.succeeded[0].conflicts, 1)
+        self.client.put.assert_called_with(
+            '/subject_sets/1',
+            json={'subject_sets': {'display_name': 'Renamed'}},
+            etag='etag-2',
+        )
+
+    def test_conflict_keeps_other_changes(self):
+        self.client.put.side_effect = [
+            ObjectConflictException('Conflict'),
+            self.put('/subject_sets/1', {'subject_sets': {}}, 'etag-2'),
+        ]
+        self.client.get.return_value = (
+            {'subject_sets': [{
+                'id': '1',
+                'display_name': 'Set 1',
+                'metadata': {'a': 1, 'b': 'changed elsewhere'},
+            }]},
+            'etag-2',
+        )
+        subject_set = self.subject_sets(1)[0]
+        with Panoptes.bulk():
+            subject_set.metadata['a'] = 2
+            subject_set.metadata['c'] = 3
+            subject_set.save()
+
+        self.client.put.assert_called_with(
+            '/subject_sets/1',
+            json={'subject_sets': {'metadata': {
+                'a': 2,
+                'b': 'changed elsewhere',
+                'c': 3,
+            }}},
+            etag='etag-2',
+        )
+
+    def test_conflict_retries_exhausted(self):
+        self.client.put.side_effect = ObjectConflictException('Conflict')
+        self.client.get.return_value = (
+            {'subject_sets': [{'id': '1', 'metadata': {'a': 1}}]},
+            'etag-2',
+        )
+        subject_set = self.subject_sets(1)[0]
+        with Panoptes.bulk(conflict_retries=2) as bulk:
+            subject_set.display_name = 'Renamed'
+            subject_set.save()
+
+        self.assertEqual(self.client.put.call_count, 3)
+        self.assertEqual(bulk.failed[0].conflicts, 2)
+        self.assertIsInstance(
+            bulk.failed[0].exception,
+            ObjectConflictException,
+        )
+
+    def test_subject_conflict_not_retried_by_save(self):
+        self.client.put.side_effect = ObjectConflictException('Conflict')
+        self.client.get.return_value = (
+            {'subjects': [{'id': '1', 'metadata': {'a': 1}}]},
+            'etag-2',
+        )
+        subject = Subject({
+            'id': '1',
+            'locations': [],
+            'metadata': {'a': 1},
+        }, etag='etag-1')
+        with Panoptes.bulk(conflict_retries=1) as bulk:
+            subject.metadata['a'] = 2
+            subject.save()
+
+        self.assertEqual(self.client.put.call_count, 2)
+        self.assertEqual(self.client.get.call_count, 1)
+        self.assertEqual(bulk.failed[0].conflicts, 1)
+        self.assertIsInstance(
+            bulk.failed[0].exception,
+            ObjectConflictException,
+        )
@@ -1,10 +1,44 @@
 import io
+import os
+import shutil
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import Mock, patch, mock_open
 
-from panoptes_client.subject import Subject, UnknownMediaException
+from panoptes_client.subject import (
+    MEDIA_TYPE_DETECTION_BYTES,
+    AsyncSaveExecutor,
+    MediaFile,
+    MediaIndex,
+    Subject,
+    TerminalProgressReporter,
+    UnknownMediaException,
+    UploadProgress,
+)
 import mimetypes
 
+import requests
+
+from panoptes_client.panoptes import PanoptesAPIException
+
+
+def to_png(path):
+    # Preprocessing functions have to be picklable
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path + '.png', 'wb') as f:
+        f.write(data.upper())
+    return path + '.png'
+
+
+def keep_original(media):
+    return None
+
+
+def fail_preprocessing(media):
+    raise ValueError('Bad image')
+
 
 class TestSubject(unittest.TestCase):
     def setUp(self):
@@ -25,7 +59,7 @@ class TestSubject(unittest.TestCase):
         fake_file = io.BytesIO(data)
         self.subject.add_location(fake_file, manual_mimetype="image/jpeg")
         self.assertEqual(self.subject.locations[-1], "image/jpeg")
-        self.assertEqual(self.subject._media_files[-1], data)
+        self.assertEqual(self.subject._media_files[-1].read(), data)
         self.assertIn("locations", self.subject.modified_attributes)
 
     @patch("panoptes_client.subject.magic")
@@ -35,7 +69,7 @@ class TestSubject(unittest.TestCase):
         fake_file = io.BytesIO(data)
         self.subject.add_location(fake_file)
         self.assertEqual(self.subject.locations[-1], "image/jpeg")
-        self.assertEqual(self.subject._media_files[-1], data)
+        self.assertEqual(self.subject._media_files[-1].read(), data)
         self.assertIn("locations", self.subject.modified_attributes)
         mock_magic.from_buffer.assert_called_with(data, mime=True)
 
@@ -47,13 +81,601 @@ class TestSubject(unittest.TestCase):
         m = mock_open(read_data=b"fake image data")
         with patch("panoptes_client.subject.open", m, create=True):
             self.subject.add_location("dummy.jpg")
+            self.assertEqual(
+                self.subject._media_files[-1].read(),
+                b"fake image data",
+            )
 
         self.assertEqual(self.subject.locations[-1], "image/jpeg")
-        self.assertEqual(self.subject._media_files[-1], b"fake image data")
+        self.assertEqual(self.subject._media_files[-1].path, "dummy.jpg")
         self.assertIn("locations", self.subject.modified_attributes)
+        mock_guess_type.assert_called_with("dummy.jpg")
+
+    @patch("panoptes_client.subject.magic", create=True)
+    @patch("panoptes_client.subject.MEDIA_TYPE_DETECTION", 'magic')
+    def test_add_location_signature_detection(self, mock_magic):
+        self.subject.add_location(io.BytesIO(b"\x89PNG\r\n\x1a\ndata"))
+        self.assertEqual(self.subject.locations[-1], "image/png")
+        mock_magic.from_buffer.assert_not_called()
+
+    @patch("panoptes_client.subject.MEDIA_TYPE_DETECTION", 'mimetypes')
+    def test_add_location_signature_detection_without_magic(self):
+        self.subject.add_location(io.BytesIO(b"GIF89adata"))
+        self.assertEqual(self.subject.locations[-1], "image/gif")
+        with self.assertRaises(UnknownMediaException):
+            self.subject.add_location(io.BytesIO(b"fake image data"))
+
+    @patch("panoptes_client.subject.magic", create=True)
+    @patch("panoptes_client.subject.MEDIA_TYPE_DETECTION", 'magic')
+    def test_add_location_magic_falls_back_to_extension(self, mock_magic):
+        mock_magic.from_buffer.return_value = "application/octet-stream"
+        m = mock_open(read_data=b"[1, 2, 3]")
+        with patch("panoptes_client.subject.open", m, create=True):
+            self.subject.add_location("data.json")
+        self.assertEqual(self.subject.locations[-1], "application/json")
+
+    def test_add_location_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.subject.add_location(
+                '/missing/image.png',
+                manual_mimetype='image/png',
+            )
+        self.assertEqual(self.subject.locations, [])
 
     def test_add_location_invalid_manual_mimetype(self):
         data = b"fake data"
         fake_file = io.BytesIO(data)
         with self.assertRaises(UnknownMediaException):
-            self.subject.add_location(fake_file, manual_mimetype="application/javascript")
\ No newline at end of file
+            self.subject.add_location(fake_file, manual_mimetype="application/javascript")
+
+
+class TestMediaFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+        self.tmp.write(b'x' * 100000)
+        self.tmp.close()
+        self.addCleanup(os.remove, self.tmp.name)
+
+    @patch("panoptes_client.subject.magic", create=True)
+    @patch("panoptes_client.subject.MEDIA_TYPE_DETECTION", 'magic')
+    def test_file_not_kept_in_memory(self, mock_magic):
+        mock_magic.from_buffer.return_value = "image/png"
+        subject = Subject()
+        subject.add_location(self.tmp.name)
+        media_file = subject._media_files[0]
+        self.assertEqual(media_file.path, self.tmp.name)
+        self.assertIsNone(media_file.data)
+        detected = mock_magic.from_buffer.call_args[0][0]
+        self.assertEqual(len(detected), MEDIA_TYPE_DETECTION_BYTES)
+
+    def test_file_object_read(self):
+        data = b'\x89PNG\r\n\x1a\n' + b'x' * 100
+        with tempfile.NamedTemporaryFile(suffix='.png') as f:
+            f.write(data)
+            f.seek(0)
+            subject = Subject()
+            subject.add_location(f)
+            self.assertTrue(f.closed)
+        media_file = subject._media_files[0]
+        self.assertIsNone(media_file.path)
+        self.assertEqual(media_file.read(), data)
+        self.assertEqual(subject.locations, ['image/png'])
+
+    def test_upload_streams_from_disk(self):
+        uploaded = []
+
+        def put(url, headers, data):
+            uploaded.append(data.read())
+            return Mock()
+
+        client = Mock()
+        client.upload_session().put.side_effect = put
+        media_file = MediaFile(path=self.tmp.name)
+        subject = Subject()
+        for _ in range(2):
+            subject._upload_media(
+                'https://example.com',
+                media_file,
+                'image/png',
+                client,
+            )
+        self.assertEqual(uploaded, [b'x' * 100000] * 2)
+        client.upload_session.assert_called_with('https://example.com')
+
+
+class TestAsyncSaves(unittest.TestCase):
+    def test_submit_blocks_when_queue_full(self):
+        release = threading.Event()
+        executor = AsyncSaveExecutor(max_workers=1, max_queued=2)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release.set)
+        executor.submit(release.wait)
+        executor.submit(release.wait)
+
+        submitted = threading.Event()
+        producer = threading.Thread(
+            target=lambda: (executor.submit(release.wait), submitted.set()),
+        )
+        producer.start()
+        self.assertFalse(submitted.wait(0.1))
+        self.assertEqual(executor.pending, 2)
+
+        release.set()
+        self.assertTrue(submitted.wait(1))
+        producer.join()
+        executor.shutdown()
+        self.assertEqual(executor.pending, 0)
+        self.assertEqual(executor.high_water_mark, 2)
+
+    def subject(self, pc):
+        pc.client().object_cache = None
+        pc.client().post.return_value = (
+            {'subjects': [{
+                'id': '1',
+                'locations': [{'image/png': 'https://example.com/upload'}],
+                'metadata': {'a': 1},
+            }]},
+            'abc',
+        )
+        subject = Subject()
+        subject.links.project = 1
+        subject.metadata['a'] = 1
+        subject.add_location(io.BytesIO(b'data'), manual_mimetype='image/png')
+        return subject
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_uploads_on_upload_threads(self, pc):
+        threads = []
+
+        def upload(url, media_data, media_type, client, progress=None):
+            threads.append(threading.current_thread().name)
+
+        with Subject.async_saves(max_workers=2, max_uploads=3) as pool:
+            subject = self.subject(pc)
+            with patch.object(subject, '_upload_media', side_effect=upload):
+                subject.save()
+                pool.shutdown()
+        self.assertTrue(subject.async_save_result)
+        self.assertEqual(len(threads), 1)
+        self.assertEqual(pool.max_uploads, 3)
+        self.assertEqual(pool.max_queued, 4)
+
+    @patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_upload_failure_reported(self, pc):
+        error = requests.exceptions.ConnectionError()
+        with Subject.async_saves() as pool:
+            subject = self.subject(pc)
+            with patch.object(subject, '_upload_media', side_effect=error):
+                subject.save()
+                pool.shutdown()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            subject.async_save_result
+
+    @patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_wait_all_lists_failures(self, pc):
+        error = requests.exceptions.ConnectionError()
+        with Subject.async_saves(keep_results=True) as pool:
+            failing = self.subject(pc)
+            media_file = failing._media_files[0]
+            with patch.object(failing, '_upload_media', side_effect=error):
+                future = failing.save()
+                failures = pool.wait_all()
+            succeeding = self.subject(pc)
+            with patch.object(succeeding, '_upload_media'):
+                succeeding.save()
+                pool.wait_all()
+
+        self.assertIs(future, failing._async_future)
+        self.assertEqual(len(failures), 1)
+        self.assertIs(failures[0].subject, failing)
+        self.assertEqual(failures[0].files, [media_file])
+        self.assertIs(failures[0].exception, error)
+        self.assertEqual(pool.succeeded, [succeeding])
+        self.assertEqual(pool.succeeded_count, 1)
+
+    def test_finished_saves_not_kept(self):
+        release = threading.Event()
+        subjects = [Mock() for _ in range(3)]
+        executor = AsyncSaveExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release.set)
+        executor._submit_save(subjects[0], [], lambda: None)
+        executor.wait_all(timeout=1)
+        executor._submit_save(subjects[1], [], release.wait)
+        executor._submit_save(subjects[2], [], release.wait)
+
+        self.assertEqual(executor.succeeded_count, 1)
+        self.assertEqual(executor.succeeded, [])
+        self.assertEqual(len(executor._pending_saves), 2)
+        completed = executor.as_completed(timeout=1)
+        release.set()
+        self.assertCountEqual(
+            [subject for subject, _ in completed],
+            subjects[1:],
+        )
+        executor.wait_all(timeout=1)
+        self.assertEqual(executor.succeeded_count, 3)
+        self.assertEqual(executor._pending_saves, {})
+
+    def test_cancel_on_error(self):
+        release = threading.Event()
+        subjects = [Mock() for _ in range(4)]
+
+        def fail():
+            release.wait()
+            raise ValueError()
+
+        executor = AsyncSaveExecutor(
+            max_workers=1,
+            max_queued=3,
+            cancel_on_error=True,
+        )
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release.set)
+        executor._submit_save(subjects[0], [], fail)
+        executor._submit_save(subjects[1], [], release.wait)
+        executor._submit_save(subjects[2], [], release.wait)
+        release.set()
+        failures = executor.wait_all(timeout=1)
+        later = executor._submit_save(subjects[3], [], release.wait)
+
+        self.assertEqual([f.subject for f in failures], [subjects[0]])
+        self.assertIsInstance(executor.error, ValueError)
+        self.assertTrue(later.cancelled())
+        self.assertEqual(executor.cancelled, subjects[1:])
+
+
+class TestMediaIndex(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.index_path = os.path.join(self.dir, 'index')
+        self.files = []
+        for name, data in (('a', b'same'), ('b', b'same'), ('c', b'other')):
+            path = os.path.join(self.dir, name + '.png')
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.files.append(path)
+
+    def test_identical_media_reused(self):
+        index = MediaIndex(self.index_path)
+        self.addCleanup(index.close)
+        first = Subject({'id': '1'})
+        first.add_location(
+            self.files[0],
+            manual_mimetype='image/png',
+            media_index=index,
+        )
+        first._upload_media(
+            'https://example.com/a.png?sig=abc',
+            first._media_files[-1],
+            'image/png',
+            Mock(),
+        )
+
+        second = Subject()
+        second.add_location(
+            self.files[1],
+            manual_mimetype='image/png',
+            media_index=index,
+        )
+        second.add_location(
+            self.files[2],
+            manual_mimetype='image/png',
+            media_index=index,
+        )
+        self.assertEqual(
+            second.locations[0],
+            {'image/png': 'https://example.com/a.png'},
+        )
+        self.assertIsNone(second._media_files[0])
+        self.assertEqual(second.locations[1], 'image/png')
+        self.assertEqual(index.hits, 1)
+
+    def test_index_persisted(self):
+        index = MediaIndex(self.index_path)
+        index.add('abc123', '1', 'image/png', 'https://example.com/a.png')
+        index.close()
+        index = MediaIndex(self.index_path)
+        self.addCleanup(index.close)
+        self.assertEqual(index.get('abc123')['subject'], '1')
+        self.assertEqual(len(index), 1)
+
+    def test_partial_line_removed(self):
+        with open(self.index_path, 'w') as f:
+            f.write('{"sha256": "abc123", "subject": "1"}\n{"sha256": "de')
+        index = MediaIndex(self.index_path)
+        index.add('def456', '2', 'image/png', 'https://example.com/b.png')
+        index.close()
+        index = MediaIndex(self.index_path)
+        self.addCleanup(index.close)
+        self.assertEqual(index.get('def456')['subject'], '2')
+        self.assertEqual(len(index), 2)
+
+
+class TestExpiredUploadUrls(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        pc = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('panoptes_client.subject.Panoptes', pc)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pc.client()
+        self.client.object_cache = None
+        self.client.reload_after_save = False
+        self.client.post.return_value = self.response('old')
+        self.client.put.return_value = self.response('new')
+        self.uploaded = []
+
+    def response(self, generation):
+        return (
+            {'subjects': [{
+                'id': '1',
+                'locations': [
+                    {'image/png': 'https://example.com/{}/0?sig=1'.format(
+                        generation
+                    )},
+                    {'image/png': 'https://example.com/remote.png'},
+                    {'image/png': 'https://example.com/{}/2?sig=1'.format(
+                        generation
+                    )},
+                ],
+                'metadata': {'a': 1},
+            }]},
+            generation + '-etag',
+        )
+
+    def send_media(self, url, media_data, media_type, client, progress=None):
+        if '/old/0' in url:
+            response = Mock(status_code=403)
+            raise requests.exceptions.HTTPError(response=response)
+        self.uploaded.append(url)
+
+    def subject(self):
+        subject = Subject()
+        subject.links.project = 1
+        subject.metadata['a'] = 1
+        subject.add_location(io.BytesIO(b'0'), manual_mimetype='image/png')
+        subject.add_location({'image/png': 'https://example.com/remote.png'})
+        subject.add_location(io.BytesIO(b'2'), manual_mimetype='image/png')
+        return subject
+
+    def test_new_urls_requested(self):
+        subject = self.subject()
+        with patch.object(subject, '_send_media', side_effect=self.send_media):
+            subject.save()
+
+        self.client.put.assert_called_once_with(
+            '/subjects/1',
+            {},
+            {},
+            {'subjects': {'locations': [
+                'image/png',
+                {'image/png': 'https://example.com/remote.png'},
+                'image/png',
+            ]}},
+            etag='old-etag',
+        )
+        self.assertIn('https://example.com/new/0?sig=1', self.uploaded)
+        self.assertIn('https://example.com/new/2?sig=1', self.uploaded)
+        self.assertEqual(subject.etag, 'new-etag')
+
+    def test_gives_up_if_urls_keep_expiring(self):
+        self.client.put.return_value = self.response('old')
+        subject = self.subject()
+        with patch.object(subject, '_send_media', side_effect=self.send_media):
+            with self.assertRaises(PanoptesAPIException):
+                subject.save()
+        self.assertEqual(self.client.put.call_count, 3)
+
+
+class TestUploadProgress(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        pc = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('panoptes_client.subject.Panoptes', pc)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pc.client()
+        self.client.object_cache = None
+        self.client.reload_after_save = False
+        self.client.post.return_value = (
+            {'subjects': [{
+                'id': '1',
+                'locations': [
+                    {'image/png': 'https://example.com/0'},
+                    {'image/png': 'https://example.com/1'},
+                ],
+                'metadata': {},
+            }]},
+            'abc',
+        )
+        self.client.upload_session().put.side_effect = (
+            lambda url, headers, data: Mock(content=data.read())
+        )
+
+    def subject(self):
+        subject = Subject()
+        subject.links.project = 1
+        subject.add_location(io.BytesIO(b'1234'), manual_mimetype='image/png')
+        subject.add_location(io.BytesIO(b'567'), manual_mimetype='image/png')
+        return subject
+
+    def test_counts_async_saves(self):
+        updates = []
+        progress = UploadProgress(callback=updates.append)
+        with Subject.async_saves(progress=progress):
+            self.subject().save()
+            self.subject().save()
+
+        self.assertEqual(progress.subjects_saved, 2)
+        self.assertEqual(progress.subjects_failed, 0)
+        self.assertEqual(progress.files_queued, 4)
+        self.assertEqual(progress.files_done, 4)
+        self.assertEqual(progress.files_failed, 0)
+        self.assertEqual(progress.bytes_queued, 14)
+        self.assertEqual(progress.bytes_sent, 14)
+        self.assertTrue(updates)
+        self.assertIs(updates[0], progress)
+
+    @patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+    def test_counts_failures(self):
+        self.client.upload_session().put.side_effect = (
+            requests.exceptions.ConnectionError
+        )
+        progress = UploadProgress()
+        with Subject.async_saves(progress=progress):
+            self.subject().save()
+
+        self.assertEqual(progress.subjects_saved, 0)
+        self.assertEqual(progress.subjects_failed, 1)
+        self.assertEqual(progress.files_failed, 2)
+
+    def test_eta(self):
+        progress = UploadProgress()
+        self.assertIsNone(progress.eta)
+        progress.started -= 10
+        progress.update(bytes_queued=300, bytes_sent=100)
+        self.assertAlmostEqual(progress.rate, 10, places=0)
+        self.assertAlmostEqual(progress.eta, 20, places=0)
+
+    def test_terminal_reporter_throttles(self):
+        stream = io.StringIO()
+        progress = UploadProgress(
+            callback=TerminalProgressReporter(stream=stream, interval=60),
+        )
+        progress.update(files_queued=2)
+        progress.update(files_done=1)
+        self.assertEqual(stream.getvalue().count('\r'), 1)
+        self.assertIn('0/2 files', stream.getvalue())
+
+
+@patch('panoptes_client.subject.MEDIA_TYPE_DETECTION', 'mimetypes')
+class TestPreprocess(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        pc = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('panoptes_client.subject.Panoptes', pc)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pc.client()
+        self.client.object_cache = None
+        self.client.reload_after_save = False
+        self.client.post.side_effect = self.post
+        self.uploaded = []
+        self.client.upload_session().put.side_effect = self.put
+
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, 'image.txt')
+        with open(self.path, 'wb') as f:
+            f.write(b'image')
+
+    def post(self, path, json=None, **kwargs):
+        return (
+            {'subjects': [{
+                'id': '1',
+                'locations': [
+                    {media_type: 'https://example.com/0'}
+                    for media_type in json['subjects']['locations']
+                ],
+                'metadata': {},
+            }]},
+            'abc',
+        )
+
+    def put(self, url, headers, data):
+        self.uploaded.append((headers['Content-Type'], data.read()))
+        return Mock()
+
+    def save(self, preprocess):
+        with Subject.async_saves(preprocess=preprocess, preprocess_workers=1):
+            subject = Subject()
+            subject.links.project = 1
+            subject.add_location(self.path)
+            subject.save()
+        return subject
+
+    def test_preprocessed_before_upload(self):
+        subject = self.save(to_png)
+        self.assertTrue(subject.async_save_result)
+        posted = self.client.post.call_args[1]['json']
+        self.assertEqual(posted['subjects']['locations'], ['image/png'])
+        self.assertEqual(self.uploaded, [('image/png', b'IMAGE')])
+
+    def test_original_kept(self):
+        subject = self.save(keep_original)
+        self.assertTrue(subject.async_save_result)
+        self.assertEqual(self.uploaded, [('text/plain', b'image')])
+
+    def test_preprocessing_failure_fails_save(self):
+        subject = self.save(fail_preprocessing)
+        with self.assertRaises(ValueError):
+            subject.async_save_result
+        self.client.post.assert_not_called()
+
+
+class TestSaveAttachedImages(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        pc = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('panoptes_client.subject.Panoptes', pc)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pc.client()
+        self.client.post.side_effect = self.post
+        self.client.upload_session().put.side_effect = self.put
+        self.posted = []
+        self.uploaded = {}
+        self.lock = threading.Lock()
+
+    def post(self, path, params=None, headers=None, json=None, **kwargs):
+        subject_id = path.split('/')[2]
+        with self.lock:
+            self.posted.append((subject_id, json['media']['metadata']))
+        return (
+            {'media': [{'src': 'https://example.com/{}'.format(subject_id)}]},
+            'abc',
+        )
+
+    def put(self, url, headers, data):
+        if url.endswith('/3'):
+            raise requests.exceptions.ConnectionError()
+        self.uploaded[url] = data.read()
+        return Mock()
+
+    @patch('panoptes_client.subject.UPLOAD_RETRY_LIMIT', 1)
+    def test_report(self):
+        images = (
+            (
+                Subject({'id': str(i)}),
+                io.BytesIO(b'GIF89a' + str(i).encode()),
+                {'n': i},
+            )
+            for i in range(1, 6)
+        )
+        previous = getattr(Subject._local, 'save_exec', None)
+        report = Subject.save_attached_images(images, max_workers=2)
+
+        self.assertEqual(
+            sorted(subject.id for subject in report.succeeded),
+            ['1', '2', '4', '5'],
+        )
+        self.assertEqual(len(report.failures), 1)
+        self.assertEqual(report.failures[0].subject.id, '3')
+        self.assertIsInstance(
+            report.failures[0].exception,
+            requests.exceptions.ConnectionError,
+        )
+        self.assertEqual(
+            sorted(self.posted),
+            [(str(i), {'n': i}) for i in range(1, 6)],
+        )
+        self.assertEqual(self.uploaded['https://example.com/5'], b'GIF89a5')
+        self.assertIs(getattr(Subject._local, 'save_exec', None), previous)
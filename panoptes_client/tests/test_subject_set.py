@@ -39,3 +39,60 @@ class TestSubjectSet(unittest.TestCase):
                 },
                 etag=None,
             )
+
+
+def set_member_subjects_response(subject_ids):
+    return (
+        {
+            'set_member_subjects': [
+                {'id': 'sms' + str(_id), 'links': {'subject': str(_id)}}
+                for _id in subject_ids
+            ],
+            'meta': {'set_member_subjects': {'next_href': None}},
+        },
+        'abc',
+    )
+
+
+class TestContainsMany(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        self.client = patcher.start().client()
+        self.addCleanup(patcher.stop)
+        self.client.object_cache = None
+        self.in_set = set(str(i) for i in range(0, 1000, 2))
+
+    def subject_set(self, set_member_subjects_count):
+        return SubjectSet({
+            'id': '1',
+            'metadata': {'a': 1},
+            'set_member_subjects_count': set_member_subjects_count,
+            'links': {'subjects': []},
+        }, etag='abc')
+
+    def lookup(self, path, params, *args, **kwargs):
+        requested = params.get('subject_id')
+        if requested is None:
+            return set_member_subjects_response(sorted(self.in_set))
+        return set_member_subjects_response(
+            _id for _id in requested.split(',') if _id in self.in_set
+        )
+
+    def test_batched_lookup(self):
+        self.client.get.side_effect = self.lookup
+        present = self.subject_set(500).contains_many(range(150))
+        self.assertEqual(present, set(str(i) for i in range(0, 150, 2)))
+        self.assertEqual(self.client.get.call_count, 2)
+        for call in self.client.get.call_args_list:
+            self.assertIn('subject_id', call[0][1])
+
+    def test_scans_small_set(self):
+        self.client.get.side_effect = self.lookup
+        present = self.subject_set(500).contains_many(range(1000))
+        self.assertEqual(present, self.in_set)
+        self.assertEqual(self.client.get.call_count, 1)
+        self.assertNotIn('subject_id', self.client.get.call_args[0][1])
+
+    def test_empty(self):
+        self.assertEqual(self.subject_set(500).contains_many([]), set())
+        self.client.get.assert_not_called()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+
+from panoptes_client.subject_workflow_status import SubjectWorkflowStatus
+
+
+def status_response(path, params, *args, **kwargs):
+    subject_ids = params['subject_ids'].split(',')
+    return (
+        {
+            'subject_workflow_statuses': [
+                {'id': 's' + _id, 'retirement_reason': 'done'}
+                for _id in subject_ids
+            ],
+            'meta': {
+                'subject_workflow_statuses': {'next_href': None},
+            },
+        },
+        'abc',
+    )
+
+
+class TestForSubjects(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('panoptes_client.panoptes.Panoptes')
+        self.client = patcher.start().client()
+        self.addCleanup(patcher.stop)
+        self.client.object_cache = None
+        self.client.get.side_effect = status_response
+
+    def test_batches_merged_in_order(self):
+        statuses = list(SubjectWorkflowStatus.for_subjects(
+            (str(i) for i in range(250)),
+            workflow_id=1,
+            max_workers=2,
+        ))
+        self.assertEqual(
+            [status.id for status in statuses],
+            ['s{}'.format(i) for i in range(250)],
+        )
+        self.assertEqual(self.client.get.call_count, 3)
+        for call in self.client.get.call_args_list:
+            params = call[0][1]
+            self.assertEqual(params['workflow_id'], 1)
+            self.assertEqual(
+                params['page_size'],
+                len(params['subject_ids'].split(',')),
+            )
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch
+
+from panoptes_client.panoptes import UPLOAD_POOL_SIZE, Panoptes
+from panoptes_client.subject import BLOCK_UPLOAD_THREADS, Subject
+
+
+class TestUploadSession(unittest.TestCase):
+    def setUp(self):
+        self.client = Panoptes()
+
+    def test_one_session_per_host(self):
+        first = self.client.upload_session('https://blob.example.com/a?sig=1')
+        second = self.client.upload_session('https://blob.example.com/b?sig=2')
+        other = self.client.upload_session('https://other.example.com/a')
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIsNot(first, self.client.session)
+
+    def test_pool_size(self):
+        session = self.client.upload_session('https://blob.example.com/a')
+        adapter = session.get_adapter('https://blob.example.com/a')
+        self.assertEqual(adapter._pool_maxsize, UPLOAD_POOL_SIZE)
+
+    def test_pool_grows(self):
+        old_session = self.client.upload_session('https://blob.example.com/a')
+        old_adapter = old_session.get_adapter('https://blob.example.com/a')
+        self.client.set_upload_pool_size(40)
+        self.client.set_upload_pool_size(20)
+        session = self.client.upload_session('https://blob.example.com/a')
+        self.assertIsNot(session, old_session)
+        self.assertIs(
+            old_session.get_adapter('https://blob.example.com/a'),
+            old_adapter,
+        )
+        adapter = session.get_adapter('https://blob.example.com/a')
+        self.assertEqual(adapter._pool_maxsize, 40)
+        session = self.client.upload_session('https://other.example.com/a')
+        adapter = session.get_adapter('https://other.example.com/a')
+        self.assertEqual(adapter._pool_maxsize, 40)
+
+    def test_async_saves_size_pool(self):
+        with Subject.async_saves(max_uploads=12) as pool:
+            subject = Subject()
+            with patch.object(subject, '_save'):
+                with self.client:
+                    subject.save()
+        self.assertEqual(pool.upload_pool_size, 12 * BLOCK_UPLOAD_THREADS)
+        self.assertEqual(
+            self.client._upload_pool_size,
+            12 * BLOCK_UPLOAD_THREADS,
+        )
+
+    def test_no_credentials(self):
+        self.client.session.headers['Authorization'] = 'Bearer 1234'
+        session = self.client.upload_session('https://blob.example.com/a')
+        self.assertNotIn('Authorization', session.headers)
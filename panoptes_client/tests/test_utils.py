@@ -0,0 +1,176 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from panoptes_client.utils import BatchResult, batchable, split_ids
+
+
+class Recorder(object):
+    def __init__(self, fail_on=()):
+        self.batches = []
+        self.fail_on = fail_on
+        self.threads = set()
+
+    @batchable(batch_size=2)
+    def process(self, items, suffix=''):
+        self.threads.add(threading.current_thread().name)
+        # Later batches finish first, to check results stay in order
+        time.sleep(0.001 * max(0, 10 - len(self.batches)))
+        self.batches.append(list(items))
+        if items[0] in self.fail_on:
+            raise ValueError(items[0])
+        return [str(item) + suffix for item in items]
+
+
+class TestBatchable(unittest.TestCase):
+    def test_single_item(self):
+        recorder = Recorder()
+        result = recorder.process(1)
+        self.assertEqual(recorder.batches, [[1]])
+        self.assertEqual(result.results, [['1']])
+
+    def test_serial_batches(self):
+        recorder = Recorder()
+        result = recorder.process([1, 2, 3, 4, 5], suffix='!')
+        self.assertIsInstance(result, BatchResult)
+        self.assertEqual(recorder.batches, [[1, 2], [3, 4], [5]])
+        self.assertEqual(result.results, [['1!', '2!'], ['3!', '4!'], ['5!']])
+        self.assertEqual(result.failed, [])
+
+    def test_batch_size_override(self):
+        recorder = Recorder()
+        recorder.process([1, 2, 3], batch_size=3)
+        self.assertEqual(recorder.batches, [[1, 2, 3]])
+
+    def test_serial_raises(self):
+        recorder = Recorder(fail_on=(3,))
+        with self.assertRaises(ValueError):
+            recorder.process([1, 2, 3, 4, 5])
+        self.assertEqual(recorder.batches, [[1, 2], [3, 4]])
+
+    def test_serial_collects_errors(self):
+        recorder = Recorder(fail_on=(3,))
+        result = recorder.process([1, 2, 3, 4, 5], raise_errors=False)
+        self.assertEqual(len(recorder.batches), 3)
+        self.assertEqual([batch for batch, _ in result.succeeded], [[1, 2], [5]])
+        self.assertEqual(result.failed[0][0], [3, 4])
+        self.assertIsInstance(result.failed[0][1], ValueError)
+        self.assertEqual(result.failed_items, [3, 4])
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_concurrent_batches(self, pc):
+        recorder = Recorder()
+        result = recorder.process(list(range(10)), max_workers=3)
+        self.assertEqual(len(recorder.batches), 5)
+        self.assertEqual(
+            result.results,
+            [[str(i), str(i + 1)] for i in range(0, 10, 2)],
+        )
+        self.assertNotIn(threading.current_thread().name, recorder.threads)
+        self.assertEqual(pc.client().__enter__.call_count, 5)
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_concurrent_collects_errors(self, pc):
+        recorder = Recorder(fail_on=(2, 6))
+        result = recorder.process(
+            list(range(10)),
+            max_workers=3,
+            raise_errors=False,
+        )
+        self.assertEqual(len(result.succeeded), 3)
+        self.assertEqual(result.failed_items, [2, 3, 6, 7])
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_concurrent_raises(self, pc):
+        recorder = Recorder(fail_on=(2,))
+        with self.assertRaises(ValueError):
+            recorder.process(list(range(10)), max_workers=3)
+
+    def test_generator_input(self):
+        recorder = Recorder()
+        result = recorder.process(i for i in range(5))
+        self.assertEqual(recorder.batches, [[0, 1], [2, 3], [4]])
+        self.assertEqual(result.succeeded_count, 3)
+
+    def test_range_input(self):
+        recorder = Recorder()
+        recorder.process(range(3))
+        self.assertEqual(recorder.batches, [[0, 1], [2]])
+
+    def test_strings_and_dicts_are_single_items(self):
+        recorder = Recorder()
+        recorder.process('abc')
+        recorder.process({'a': 1})
+        self.assertEqual(recorder.batches, [['abc'], [{'a': 1}]])
+
+    def test_generator_consumed_lazily(self):
+        recorder = Recorder()
+        consumed = []
+
+        def items():
+            for i in range(6):
+                consumed.append(i)
+                yield i
+
+        recorder.process(items())
+        self.assertEqual(len(consumed), 6)
+
+        recorder = Recorder(fail_on=(2,))
+        consumed[:] = []
+        with self.assertRaises(ValueError):
+            recorder.process(items())
+        self.assertEqual(consumed, [0, 1, 2, 3])
+
+    def test_discard_results(self):
+        recorder = Recorder()
+        result = recorder.process(range(5), keep_results=False)
+        self.assertEqual(result.succeeded, [])
+        self.assertEqual(result.succeeded_count, 3)
+
+    @patch('panoptes_client.panoptes.Panoptes')
+    def test_concurrent_bounded_in_flight(self, pc):
+        recorder = Recorder()
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        recorder.process(items(), max_workers=2, raise_errors=False)
+        self.assertEqual(len(recorder.batches), 50)
+
+        recorder = Recorder(fail_on=(0,))
+        consumed[:] = []
+        with self.assertRaises(ValueError):
+            recorder.process(items(), max_workers=2)
+        self.assertLess(len(consumed), 100)
+
+
+class TestSplitIds(unittest.TestCase):
+    def test_batch_size(self):
+        self.assertEqual(
+            list(split_ids(range(5), batch_size=2)),
+            [[0, 1], [2, 3], [4]],
+        )
+
+    def test_max_length(self):
+        # Each ID is 3 characters, and each encoded comma is 3 more
+        self.assertEqual(
+            list(split_ids(range(100, 105), max_length=9)),
+            [[100, 101], [102, 103], [104]],
+        )
+
+    def test_objects_measured_by_id(self):
+        items = [Mock(id='1' * 5), Mock(id='2' * 5)]
+        self.assertEqual(
+            list(split_ids(items, max_length=10)),
+            [items[:1], items[1:]],
+        )
+
+    def test_item_longer_than_max_length(self):
+        self.assertEqual(
+            list(split_ids(['abcdef', 'g'], max_length=3)),
+            [['abcdef'], ['g']],
+        )
@@ -1,6 +1,13 @@
 from builtins import range
 
+import collections
 import functools
+import itertools
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
 
 ITERABLE_TYPES = (
@@ -9,35 +16,173 @@ ITERABLE_TYPES = (
     tuple,
 )
 
+# Batches of these are taken by slicing rather than by iterating
+SLICEABLE_TYPES = (
+    list,
+    tuple,
+)
+
 MISSING_POSITIONAL_ERR = 'Required positional argument (pos 1) not found'
 
+# The longest comma-separated list of IDs, once URL encoded, which is put in a
+# single request URL. Many servers and proxies reject request lines longer
+# than 8KB, so this leaves plenty of room for the rest of the URL.
+MAX_ID_LIST_LENGTH = 4000
+
 try:
     from numpy import ndarray
     ITERABLE_TYPES = ITERABLE_TYPES + (ndarray,)
+    SLICEABLE_TYPES = SLICEABLE_TYPES + (ndarray,)
 except ImportError:
     pass
 
 
+# Iterable, but treated as single values
+NON_ITERABLE_TYPES = (
+    str,
+    bytes,
+    dict,
+)
+
+
 def isiterable(v):
-    return isinstance(v, ITERABLE_TYPES)
+    if isinstance(v, ITERABLE_TYPES):
+        return True
+    return (
+        isinstance(v, collections.abc.Iterable)
+        and not isinstance(v, NON_ITERABLE_TYPES)
+    )
 
 
 def split(to_batch, batch_size):
-    if type(to_batch) == set:
-        to_batch = tuple(to_batch)
-    for batch in [
-        to_batch[i:i + batch_size]
-        for i in range(0, len(to_batch), batch_size)
-    ]:
+    """
+    Lazily yields lists (or slices, for sequences) of up to **batch_size**
+    items from any iterable, without copying the whole input first.
+    """
+    if isinstance(to_batch, SLICEABLE_TYPES):
+        for i in range(0, len(to_batch), batch_size):
+            yield to_batch[i:i + batch_size]
+        return
+
+    iterator = iter(to_batch)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
         yield batch
 
 
-def batchable(func=None, batch_size=100):
+def split_ids(ids, batch_size=100, max_length=MAX_ID_LIST_LENGTH):
+    """
+    Lazily yields lists of up to **batch_size** items from **ids**, which is
+    any iterable of IDs or :py:class:`.PanoptesObject` instances. Each list
+    is also kept short enough that its URL encoded, comma-separated IDs are
+    no longer than **max_length** characters.
+    """
+    separator_length = len(quote(',', safe=''))
+    batch = []
+    length = 0
+    for item in ids:
+        item_length = len(quote(str(getattr(item, 'id', item)), safe=''))
+        if batch:
+            item_length += separator_length
+        if batch and (
+            len(batch) >= batch_size or length + item_length > max_length
+        ):
+            yield batch
+            batch = []
+            length = 0
+            item_length -= separator_length
+        batch.append(item)
+        length += item_length
+    if batch:
+        yield batch
+
+
+class BatchResult(object):
+    """
+    Returned by functions decorated with :py:func:`batchable`.
+
+    - **succeeded** is a list of ``(batch, return_value)`` tuples, in batch
+      order. Left empty when called with ``keep_results=False``.
+    - **succeeded_count** is the number of successful batches.
+    - **failed** is a list of ``(batch, exception)`` tuples, in batch order.
+      Only populated when called with ``raise_errors=False``.
+    """
+
+    def __init__(self, keep_results=True):
+        self.keep_results = keep_results
+        self.succeeded = []
+        self.succeeded_count = 0
+        self.failed = []
+
+    def add_success(self, batch, value):
+        self.succeeded_count += 1
+        if self.keep_results:
+            self.succeeded.append((batch, value))
+
+    @property
+    def results(self):
+        """
+        The return values of the successful batches, in order.
+        """
+        return [value for _, value in self.succeeded]
+
+    @property
+    def failed_items(self):
+        """
+        A list of every item in the failed batches, which can be passed back
+        to the same function to retry just those items.
+        """
+        return [item for batch, _ in self.failed for item in batch]
+
+    def __repr__(self):
+        return '<BatchResult {} succeeded, {} failed>'.format(
+            self.succeeded_count,
+            len(self.failed),
+        )
+
+
+def batchable(func=None, batch_size=100, max_length=None):
+    """
+    Decorates a method which takes a list of items as its first argument so
+    that it can be given any number of items (or a single item), which are
+    split up and passed to the method in batches of **batch_size**. Any
+    iterable, including generators, can be given; it is consumed lazily, one
+    batch at a time.
+
+    If **max_length** is given, batches are also split so that the items'
+    IDs, joined with commas and URL encoded, fit within that many characters.
+    This is for methods which put their items in a request URL (see
+    :py:func:`split_ids`).
+
+    The decorated method also accepts these keyword arguments:
+
+    - **batch_size** overrides the default batch size.
+    - **max_workers** sends up to this many batches concurrently, using a
+      thread pool. By default batches are sent one at a time.
+    - **raise_errors** if ``True`` (the default), the first exception raised
+      by a batch is re-raised and no further batches are started. If
+      ``False``, failures are collected in the returned
+      :py:class:`BatchResult` instead.
+    - **keep_results** if ``False``, successful batches are only counted,
+      not kept, so that memory use doesn't grow with the number of items.
+
+    Returns a :py:class:`BatchResult`. For example::
+
+        result = workflow.retire_subjects(subject_ids, max_workers=4,
+                                          raise_errors=False)
+        if result.failed:
+            workflow.retire_subjects(result.failed_items)
+    """
     @functools.wraps(func)
     def do_batch(*args, **kwargs):
         if len(args) <= 1:
             raise TypeError(MISSING_POSITIONAL_ERR)
         _batch_size = kwargs.pop('batch_size', batch_size)
+        max_workers = kwargs.pop('max_workers', None)
+        raise_errors = kwargs.pop('raise_errors', True)
+        keep_results = kwargs.pop('keep_results', True)
 
         _self = args[0]
         to_batch = args[1]
@@ -45,14 +190,60 @@ def batchable(func=None, batch_size=100):
         if not isiterable(to_batch):
             to_batch = [to_batch]
 
-        if isinstance(to_batch, set):
-            to_batch = list(to_batch)
-
-        for batch in split(to_batch, _batch_size):
+        def run_batch(batch):
             if _self is None:
-                func(batch, *args, **kwargs)
-            else:
-                func(_self, batch, *args, **kwargs)
+                return func(batch, *args, **kwargs)
+            return func(_self, batch, *args, **kwargs)
+
+        result = BatchResult(keep_results=keep_results)
+        if max_length:
+            batches = split_ids(to_batch, _batch_size, max_length)
+        else:
+            batches = split(to_batch, _batch_size)
+
+        if not max_workers or max_workers <= 1:
+            for batch in batches:
+                try:
+                    result.add_success(batch, run_batch(batch))
+                except Exception as e:
+                    if raise_errors:
+                        raise
+                    result.failed.append((batch, e))
+            return result
+
+        # Imported here to avoid a circular import
+        from panoptes_client.panoptes import Panoptes
+        client = Panoptes.client()
+
+        def run_batch_with_client(batch):
+            with client:
+                return run_batch(batch)
+
+        # Only a bounded number of batches are queued at once, so that
+        # generators are consumed as the batches are sent
+        in_flight = collections.deque()
+
+        def collect_oldest():
+            batch, future = in_flight.popleft()
+            try:
+                result.add_success(batch, future.result())
+            except Exception as e:
+                if raise_errors:
+                    for _, pending in in_flight:
+                        pending.cancel()
+                    raise
+                result.failed.append((batch, e))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch in batches:
+                in_flight.append(
+                    (batch, executor.submit(run_batch_with_client, batch))
+                )
+                if len(in_flight) >= max_workers * 2:
+                    collect_oldest()
+            while in_flight:
+                collect_oldest()
+        return result
 
     # This avoids us having to call batchable wherever it's used, so we can
     # just write:
@@ -67,6 +258,43 @@ def batchable(func=None, batch_size=100):
     #   @batchable(batch_size=10)
     #   def func(self, ...):
     if func is None:
-        return functools.partial(batchable, batch_size=batch_size)
+        return functools.partial(
+            batchable,
+            batch_size=batch_size,
+            max_length=max_length,
+        )
 
     return do_batch
+
+
+def read_json_lines(path):
+    """
+    Returns a list of the records in the JSON lines file at **path**, or an
+    empty list if it doesn't exist. Lines which can't be parsed are skipped.
+
+    An incomplete last line, left by a crash while it was being written, is
+    removed from the file, so that records appended afterwards start on a
+    line of their own.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            try:
+                json.loads(data[end:])
+            except ValueError:
+                f.truncate(end)
+                data = data[:end]
+            else:
+                f.write(b'\n')
+
+    records = []
+    for line in data.splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
@@ -1,5 +1,4 @@
 from builtins import str
-from copy import deepcopy
 from panoptes_client.set_member_subject import SetMemberSubject
 from panoptes_client.subject_workflow_status import SubjectWorkflowStatus
 
@@ -37,41 +36,10 @@ class Workflow(PanoptesObject, Exportable):
         super(Workflow, self).__init__(raw, etag)
         if not self.configuration:
             self.configuration = {}
-            self._original_configuration = {}
         if not self.retirement:
             self.retirement = {}
-            self._original_retirement = {}
         if not self.tasks:
             self.tasks = {}
-            self._original_tasks = {}
-
-    def set_raw(self, raw, etag=None, loaded=True):
-        super(Workflow, self).set_raw(raw, etag, loaded)
-        if loaded:
-            if self.configuration:
-                self._original_configuration = deepcopy(self.configuration)
-            if self.retirement:
-                self._original_retirement = deepcopy(self.retirement)
-            if self.tasks:
-                self._original_tasks = deepcopy(self.tasks)
-        elif loaded:
-            self._original_configuration = None
-            self._original_retirement = None
-            self._original_tasks = None
-
-    def save(self):
-        """
-        Adds workflow configuration, retirement, and tasks dicts to the list of
-        savable attributes if it has changed.
-        """
-        if not self.configuration == self._original_configuration:
-            self.modified_attributes.add('configuration')
-        if not self.retirement == self._original_retirement:
-            self.modified_attributes.add('retirement')
-        if not self.tasks == self._original_tasks:
-            self.modified_attributes.add('tasks')
-
-        super(Workflow, self).save()
 
     @batchable
     def retire_subjects(self, subjects, reason='other'):
@@ -90,6 +58,8 @@ class Workflow(PanoptesObject, Exportable):
             workflow.retire_subjects([1,2,3,4])
             workflow.retire_subjects(Subject(1234))
             workflow.retire_subjects([Subject(12), Subject(34)])
+
+        Subjects are retired in batches; see :py:func:`.batchable`.
         """
 
         subjects = [s.id if isinstance(s, Subject) else s for s in subjects]
@@ -166,23 +136,28 @@ class Workflow(PanoptesObject, Exportable):
         """
         return next(SubjectWorkflowStatus.where(subject_id=subject_id, workflow_id=self.id))
 
-    def subject_workflow_statuses(self, subject_set_id):
+    def subject_workflow_statuses(self, subject_set_id, max_workers=4):
         """
         A generator which yields :py:class:`.SubjectWorkflowStatus` objects for subjects in the
         subject set of the given workflow
 
+        Statuses are fetched in concurrent batches by
+        :py:meth:`.SubjectWorkflowStatus.for_subjects`.
+
         Examples::
 
             for status in workflow.subject_workflow_statuses(1234):
                 print(status.retirement_reason)
         """
-        subject_ids = []
-        for sms in SetMemberSubject.where(subject_set_id=subject_set_id):
-            subject_ids.append(sms.links.subject.id)
-
-        subject_ids = ','.join(map(str, subject_ids))
-        for status in SubjectWorkflowStatus.where(subject_ids=subject_ids, workflow_id=self.id):
-            yield status
+        subject_ids = (
+            sms.links.subject.id
+            for sms in SetMemberSubject.where(subject_set_id=subject_set_id)
+        )
+        return SubjectWorkflowStatus.for_subjects(
+            subject_ids,
+            self.id,
+            max_workers=max_workers,
+        )
 
     """ CAESAR METHODS """
 